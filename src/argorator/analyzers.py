@@ -7,20 +7,89 @@ This module contains analyzer functions that parse shell scripts to extract:
 - Annotation metadata
 
 All analyzers are registered using the decorator pattern and operate on the
-PipelineContext object.
+AnalysisContext object.
 """
 import os
 import re
-from typing import Dict, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
-from .annotations import parse_arg_annotations, parse_script_description
+from .annotations import extract_comments, parse_comment_annotations, parse_comment_description
+from .caching import parse_cache
 from .contexts import AnalysisContext
 from .models import ScriptMetadata
 from .registry import analyzer
 
 
-SPECIAL_VARS: Set[str] = {"@", "*", "#", "?", "$", "!", "0"}
-
+SPECIAL_VARS: FrozenSet[str] = frozenset({"@", "*", "#", "?", "$", "!", "0"})
+
+# One alternation covering every kind of "$" reference so a script is scanned
+# once. The braced form only consumes "${NAME" so plain references nested in
+# expansions like ${A:-$B} are still seen. A braced reference spans up to the
+# first "}" after its name: it counts only if that brace exists, and braced
+# references starting inside that span (the B in ${A:-${B}}) do not count.
+# _scan_script tracks the span itself rather than with [^}]*\} in the pattern,
+# which would rescan to the end of the text for every unclosed "${".
+REFERENCE_PATTERN = re.compile(
+    r"\$\{(?P<braced>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|\$(?P<simple>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|\$(?P<positional>[1-9][0-9]*)"
+    r"|\$(?P<varargs>[@*])"
+)
+
+# Plain assignments and export/local/declare/readonly forms at line start
+ASSIGNMENT_PATTERN = re.compile(
+    r"^\s*(?:export\s+|local\s+|declare(?:\s+-[a-zA-Z]+)?\s+|readonly\s+)?"
+    r"(?P<assigned>[A-Za-z_][A-Za-z0-9_]*)\s*=",
+    re.MULTILINE
+)
+
+# Words that may precede the assigned name; declare also takes one -flag word
+DECLARATION_KEYWORDS: FrozenSet[str] = frozenset({"export", "local", "declare", "readonly"})
+DECLARE_FLAG_PATTERN = re.compile(r"-[a-zA-Z]+")
+
+# for VAR in ...; do (quoted or unquoted variable)
+FOR_LOOP_PATTERN = re.compile(
+    r"^\s*for\s+(?:[\"']?([A-Za-z_][A-Za-z0-9_]*)[\"']?)\s+in\s+",
+    re.MULTILINE
+)
+
+# while IFS= read -r VAR; do (quoted or unquoted variable)
+WHILE_READ_PATTERN = re.compile(
+    r"^\s*while\s+.*read\s+-r\s+(?:[\"']?([A-Za-z_][A-Za-z0-9_]*)[\"']?)\s*;?\s*do",
+    re.MULTILINE
+)
+
+# for ((VAR=...; VAR<...; VAR++)); do
+C_STYLE_FOR_PATTERN = re.compile(
+    r"^\s*for\s*\(\s*\(([A-Za-z_][A-Za-z0-9_]*)\s*=",
+    re.MULTILINE
+)
+
+# The three loop forms in one alternation; exactly one group captures per match
+LOOP_VARIABLE_PATTERN = re.compile(
+    "|".join(pattern.pattern for pattern in (FOR_LOOP_PATTERN, WHILE_READ_PATTERN, C_STYLE_FOR_PATTERN)),
+    re.MULTILINE
+)
+
+# Assignments and references in one alternation, so the analyzers that need
+# them share a single pass over the script (see scan_script)
+SCRIPT_SCAN_PATTERN = re.compile(
+    ASSIGNMENT_PATTERN.pattern + "|" + REFERENCE_PATTERN.pattern,
+    re.MULTILINE
+)
+
+POSITIONAL_PATTERN = re.compile(r"\$([1-9][0-9]*)")
+
+SHELL_TOKEN_PATTERN = re.compile(r"bash|zsh|ksh|\b(?:sh|dash)\b")
+
+# Shebang token -> interpreter, in priority order when a shebang names several
+SHELL_COMMANDS: Dict[str, str] = {
+    "bash": "/bin/bash",
+    "sh": "/bin/sh",
+    "dash": "/bin/sh",
+    "zsh": "/bin/zsh",
+    "ksh": "/bin/ksh",
+}
 
 @analyzer(order=10)
 def detect_shell_interpreter(context: AnalysisContext) -> None:
@@ -29,20 +98,15 @@ def detect_shell_interpreter(context: AnalysisContext) -> None:
     Honors a shebang if present, normalizing to a common shell path. Defaults to
     bash when a shebang is not detected.
     """
-    first_line = context.script_text.splitlines()[0] if context.script_text else ""
+    # Only the first line matters; avoid splitting the whole script
+    script_text = context.script_text
+    newline = script_text.find("\n")
+    first_line = script_text if newline == -1 else script_text[:newline]
     if first_line.startswith("#!"):
-        shebang = first_line[2:].strip()
-        # Normalize common shells
-        if "bash" in shebang:
-            context.shell_cmd = ["/bin/bash"]
-        elif re.search(r"\b(sh|dash)\b", shebang):
-            context.shell_cmd = ["/bin/sh"]
-        elif "zsh" in shebang:
-            context.shell_cmd = ["/bin/zsh"]
-        elif "ksh" in shebang:
-            context.shell_cmd = ["/bin/ksh"]
-        else:
-            context.shell_cmd = ["/bin/bash"]  # Default for unknown shebangs
+        # Normalize common shells with one scan of the shebang
+        tokens = set(SHELL_TOKEN_PATTERN.findall(first_line[2:]))
+        shell = next((cmd for token, cmd in SHELL_COMMANDS.items() if token in tokens), "/bin/bash")
+        context.shell_cmd = [shell]  # Unknown shebangs default to bash
     else:
         # Default
         context.shell_cmd = ["/bin/bash"]
@@ -54,12 +118,51 @@ def parse_defined_variables(script_text: str) -> Set[str]:
     Matches plain assignments and common declaration forms like export/local/
     declare/readonly at the start of a line.
     """
-    assignment_pattern = re.compile(
-        r"^\s*(?:export\s+|local\s+|declare(?:\s+-[a-zA-Z]+)?\s+|readonly\s+)?"
-        r"([A-Za-z_][A-Za-z0-9_]*)\s*=", 
-        re.MULTILINE
-    )
-    return set(assignment_pattern.findall(script_text))
+    return set(_defined_variables(script_text))
+
+
+@parse_cache
+def _defined_variables(script_text: str) -> FrozenSet[str]:
+    return frozenset(_scan_assignments(script_text))
+
+
+def _assignment_name(words: List[str]) -> Optional[str]:
+    """Return the assigned name for the words before a line's first "="."""
+    count = len(words)
+    if count == 1:
+        name = words[0]
+    elif count == 2 and words[0] in DECLARATION_KEYWORDS:
+        name = words[1]
+    elif count == 3 and words[0] == "declare" and DECLARE_FLAG_PATTERN.fullmatch(words[1]):
+        name = words[2]
+    else:
+        return None
+    # isidentifier() on ASCII text is exactly [A-Za-z_][A-Za-z0-9_]*
+    if name.isascii() and name.isidentifier():
+        return name
+    return None
+
+
+def _scan_assignments(script_text: str) -> Set[str]:
+    """Line-based equivalent of ASSIGNMENT_PATTERN.findall.
+
+    Only lines containing "=" are inspected, so scripts with few assignments
+    are scanned with a handful of str.find calls.
+    """
+    names: Set[str] = set()
+    find = script_text.find
+    pos = find("=")
+    while pos >= 0:
+        start = script_text.rfind("\n", 0, pos) + 1
+        name = _assignment_name(script_text[start:pos].split())
+        if name is not None:
+            names.add(name)
+        # Only the first "=" on a line can end an assignment name
+        end = find("\n", pos)
+        if end < 0:
+            break
+        pos = find("=", end)
+    return names
 
 
 def parse_loop_variables(script_text: str) -> Set[str]:
@@ -70,30 +173,74 @@ def parse_loop_variables(script_text: str) -> Set[str]:
     - while loops with read: while IFS= read -r VAR; do
     - C-style for loops: for ((VAR=...; VAR<...; VAR++)); do
     """
-    loop_vars = set()
-    
-    # for VAR in ...; do (handle both quoted and unquoted variables)
-    for_pattern = re.compile(
-        r"^\s*for\s+(?:[\"']?([A-Za-z_][A-Za-z0-9_]*)[\"']?)\s+in\s+",
-        re.MULTILINE
-    )
-    loop_vars.update(for_pattern.findall(script_text))
-    
-    # while IFS= read -r VAR; do (handle both quoted and unquoted variables)
-    while_read_pattern = re.compile(
-        r"^\s*while\s+.*read\s+-r\s+(?:[\"']?([A-Za-z_][A-Za-z0-9_]*)[\"']?)\s*;?\s*do",
-        re.MULTILINE
-    )
-    loop_vars.update(while_read_pattern.findall(script_text))
-    
-    # for ((VAR=...; VAR<...; VAR++)); do
-    c_style_for_pattern = re.compile(
-        r"^\s*for\s*\(\s*\(([A-Za-z_][A-Za-z0-9_]*)\s*=",
-        re.MULTILINE
+    return set(_loop_variables(script_text))
+
+
+@parse_cache
+def _loop_variables(script_text: str) -> FrozenSet[str]:
+    # Every loop form needs a "for" or a "read" keyword
+    if "for" not in script_text and "read" not in script_text:
+        return frozenset()
+    return frozenset(
+        for_var or while_var or c_style_var
+        for for_var, while_var, c_style_var in LOOP_VARIABLE_PATTERN.findall(script_text)
     )
-    loop_vars.update(c_style_for_pattern.findall(script_text))
-    
-    return loop_vars
+
+
+def scan_script(script_text: str) -> Dict[str, Any]:
+    """Bucket assignments and references found in a single regex pass.
+
+    Returns:
+        Dict with keys 'defined' (assigned names), 'used' (referenced names),
+        'positional' (positional indices) and 'varargs' ($@ or $* present)
+    """
+    defined, used, indices, varargs = _scan_script(script_text)
+    return {'defined': set(defined), 'used': set(used), 'positional': set(indices), 'varargs': varargs}
+
+
+@parse_cache
+def _scan_script(script_text: str) -> Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[int], bool]:
+    defined: Set[str] = set()
+    used: Set[str] = set()
+    indices: Set[int] = set()
+    varargs = False
+    # Every reference starts with "$"; without one only assignments can match
+    if "$" not in script_text:
+        defined.update(_scan_assignments(script_text))
+    else:
+        # End of the current braced span, and whether any "}" remains ahead
+        braced_end = 0
+        braces_left = True
+        find = script_text.find
+        for match in SCRIPT_SCAN_PATTERN.finditer(script_text):
+            kind = match.lastgroup
+            if kind == "braced":
+                if braces_left and match.start() >= braced_end:
+                    close = find("}", match.end())
+                    if close < 0:
+                        braces_left = False
+                    else:
+                        used.add(match.group(kind))
+                        braced_end = close + 1
+            elif kind == "assigned":
+                defined.add(match.group(kind))
+            elif kind == "positional":
+                indices.add(int(match.group(kind)))
+            elif kind == "varargs":
+                varargs = True
+            else:
+                used.add(match.group(kind))
+    return frozenset(defined), frozenset(used), frozenset(indices), varargs
+
+
+def scan_script_references(script_text: str) -> Tuple[Set[str], Set[int], bool]:
+    """Collect variable, positional and varargs references in a single pass.
+
+    Returns:
+        Tuple of (variable_names, positional_indices, varargs_present)
+    """
+    scan = scan_script(script_text)
+    return scan['used'], scan['positional'], scan['varargs']
 
 
 def parse_variable_usages(script_text: str) -> Set[str]:
@@ -101,12 +248,15 @@ def parse_variable_usages(script_text: str) -> Set[str]:
 
     Special shell parameters (e.g., $@, $1) are excluded; see SPECIAL_VARS.
     """
-    brace_pattern = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)[^}]*\}")
-    simple_pattern = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
-    candidates: Set[str] = set()
-    candidates.update(brace_pattern.findall(script_text))
-    candidates.update(simple_pattern.findall(script_text))
-    return {name for name in candidates if name and name not in SPECIAL_VARS}
+    candidates = scan_script_references(script_text)[0]
+    return candidates - SPECIAL_VARS
+
+
+def _exclude_function_parameters(indices: Set[int], exclude_function_params: Optional[Set[str]]) -> Set[int]:
+    """Drop positional indices that belong to functions driven by iterator macros."""
+    if not exclude_function_params:
+        return indices
+    return {idx for idx in indices if str(idx) not in exclude_function_params}
 
 
 def parse_positional_usages(script_text: str, exclude_function_params: Optional[Set[str]] = None) -> Tuple[Set[int], bool]:
@@ -119,17 +269,8 @@ def parse_positional_usages(script_text: str, exclude_function_params: Optional[
     Returns:
         Tuple of (positional_indices, varargs_present)
     """
-    digit_pattern = re.compile(r"\$([1-9][0-9]*)")
-    varargs_pattern = re.compile(r"\$(?:@|\*)")
-    
-    indices = {int(m) for m in digit_pattern.findall(script_text)}
-    varargs = bool(varargs_pattern.search(script_text))
-    
-    # Exclude function parameters that are used with iterator macros
-    if exclude_function_params:
-        indices = {idx for idx in indices if str(idx) not in exclude_function_params}
-    
-    return indices, varargs
+    _, indices, varargs = scan_script_references(script_text)
+    return _exclude_function_parameters(indices, exclude_function_params), varargs
 
 
 def _extract_function_parameters(script_text: str, function_target) -> Set[str]:
@@ -142,27 +283,61 @@ def _extract_function_parameters(script_text: str, function_target) -> Set[str]:
     Returns:
         Set of function parameter variable names (e.g., {'1', '2', '3'})
     """
-    lines = script_text.split('\n')
-    function_lines = lines[function_target.start_line:function_target.end_line + 1]
-    function_content = '\n'.join(function_lines)
+    # The target already carries the function's lines; no need to re-split the script
+    function_content = function_target.content
     
     # Find all positional parameter usages within the function
-    digit_pattern = re.compile(r"\$([1-9][0-9]*)")
-    param_indices = {m for m in digit_pattern.findall(function_content)}
+    param_indices = set(POSITIONAL_PATTERN.findall(function_content))
     
     return param_indices
 
 
+def _get_script_view(context: AnalysisContext) -> Dict[str, Any]:
+    """Return the shared preprocessed view of the script, building it on first use.
+
+    Holds the pieces several analyzers need so each does not re-walk the text:
+    'comments' is the stripped body of every "#" line, read by the annotation
+    and description analyzers.
+    """
+    view = context.temp_data.get('view')
+    if view is None:
+        view = {'comments': extract_comments(context.script_text)}
+        context.temp_data['view'] = view
+    return view
+
+
+@analyzer(order=5)
+def preprocess_script_text(context: AnalysisContext) -> None:
+    """Build the shared script view consumed by the comment-based analyzers."""
+    _get_script_view(context)
+
+
+def _get_script_scan(context: AnalysisContext) -> Dict[str, Any]:
+    """Return the shared single-pass scan, running it if no analyzer has yet."""
+    scan = context.temp_data.get('scan')
+    if scan is None:
+        scan = scan_script(context.script_text)
+        context.temp_data['scan'] = scan
+    return scan
+
+
+@analyzer(order=15)
+def scan_script_text(context: AnalysisContext) -> None:
+    """Scan the script once for assignments and references used by later analyzers."""
+    _get_script_scan(context)
+
+
 @analyzer(order=20)
 def analyze_variable_usages(context: AnalysisContext) -> None:
     """Find all variables referenced in the script."""
-    context.all_used_vars = parse_variable_usages(context.script_text)
+    used = _get_script_scan(context)['used']
+    context.all_used_vars = used - SPECIAL_VARS
 
 
 @analyzer(order=21)
 def analyze_defined_variables(context: AnalysisContext) -> None:
     """Extract variables that are defined within the script."""
-    context.defined_vars = parse_defined_variables(context.script_text)
+    context.defined_vars = set(_get_script_scan(context)['defined'])
 
 
 @analyzer(order=21.2)
@@ -174,23 +349,23 @@ def analyze_loop_variables(context: AnalysisContext) -> None:
 @analyzer(order=45)
 def identify_macro_iterator_variables(context: AnalysisContext) -> None:
     """Identify iterator variables from iteration macros to exclude from undefined variables."""
+    context.temp_data['macro_iterator_vars'] = set()
+    context.temp_data['macro_function_param_vars'] = set()
+    
     try:
         from .macros.parser import macro_parser
         from .macros.processor import macro_processor
         
-        # Extract variable types from annotations and pass to macro processor
-        variable_types = {}
+        # Most scripts have no macros; skip the line scan for them
+        if not macro_parser.may_contain_macros(context.script_text):
+            return
         
-        # Get types from argument annotations (if available)
-        if context.annotations:
-            for var_name, annotation in context.annotations.items():
-                variable_types[var_name] = annotation.type
+        # Pass variable types from annotations to the macro processor
+        macro_processor.set_annotation_types(context.annotations)
         
-        # Set variable types in macro processor
-        macro_processor.set_variable_types(variable_types)
-        
-        # Find all iteration macro comments
-        macro_comments = macro_parser.find_macro_comments(context.script_text)
+        # Find all iteration macro comments, splitting the script only once
+        lines = context.script_text.split('\n')
+        macro_comments = macro_parser.find_macro_comments_in_lines(lines)
         iterator_vars = set()
         function_param_vars = set()
         
@@ -199,7 +374,7 @@ def identify_macro_iterator_variables(context: AnalysisContext) -> None:
                 try:
                     # Parse the iteration macro to extract iterator variable
                     # We need a dummy target to parse the macro
-                    target = macro_parser.find_target_for_macro(context.script_text, comment.line_number)
+                    target = macro_parser.find_target_for_macro_in_lines(lines, comment.line_number)
                     if target:
                         iteration_macro = macro_parser.parse_iteration_macro(comment, target)
                         iterator_vars.add(iteration_macro.iterator_var)
@@ -219,8 +394,7 @@ def identify_macro_iterator_variables(context: AnalysisContext) -> None:
         
     except ImportError:
         # If macro modules aren't available, skip this step
-        context.temp_data['macro_iterator_vars'] = set()
-        context.temp_data['macro_function_param_vars'] = set()
+        pass
 
 
 @analyzer(order=46)
@@ -232,23 +406,21 @@ def analyze_undefined_variables(context: AnalysisContext) -> None:
     
     # Exclude iterator variables, function parameter variables, and loop variables from undefined variables
     undefined_vars = context.all_used_vars - context.defined_vars - macro_iterator_vars - macro_function_param_vars - context.loop_vars
-    context.undefined_vars = {name: None for name in sorted(undefined_vars)}
+    # Set order is fine here; analyze_environment_variables sorts when it splits
+    context.undefined_vars = dict.fromkeys(undefined_vars)
 
 
 @analyzer(order=47)
 def analyze_environment_variables(context: AnalysisContext) -> None:
     """Separate undefined variables into those with environment defaults and truly undefined."""
-    env_vars: Dict[str, str] = {}
-    remaining_undefined: Dict[str, Optional[str]] = {}
-    
-    for name in context.undefined_vars.keys():
-        if name in os.environ:
-            env_vars[name] = os.environ[name]
-        else:
-            remaining_undefined[name] = None
+    # Snapshot the keys once; os.environ encodes the key on every membership test
+    environ = os.environ
+    env_keys = frozenset(environ)
+    names = context.undefined_vars.keys()
     
-    context.env_vars = env_vars
-    context.undefined_vars = remaining_undefined
+    # Sort once here so later stages can iterate both dicts in name order as-is
+    context.env_vars = {name: environ[name] for name in sorted(names & env_keys)}
+    context.undefined_vars = dict.fromkeys(sorted(names - env_keys))
 
 
 @analyzer(order=49)
@@ -257,20 +429,25 @@ def analyze_positional_parameters(context: AnalysisContext) -> None:
     # Get function parameter variables that are used with iterator macros
     macro_function_param_vars = context.temp_data.get('macro_function_param_vars', set())
     
-    indices, varargs = parse_positional_usages(context.script_text, exclude_function_params=macro_function_param_vars)
-    context.positional_indices = indices
-    context.varargs = varargs
+    scan = _get_script_scan(context)
+    context.positional_indices = _exclude_function_parameters(scan['positional'], macro_function_param_vars)
+    context.varargs = scan['varargs']
 
 
 @analyzer(order=40)
 def analyze_annotations(context: AnalysisContext) -> None:
     """Parse comment-based annotations for argument metadata."""
-    context.annotations = parse_arg_annotations(context.script_text)
+    comments = _get_script_view(context)['comments']
+    if comments:
+        context.annotations = parse_comment_annotations(comments)
 
 
 @analyzer(order=50)
 def analyze_script_metadata(context: AnalysisContext) -> None:
     """Parse script-level metadata from comments."""
-    description = parse_script_description(context.script_text)
+    comments = _get_script_view(context)['comments']
+    if not comments:
+        return
+    description = parse_comment_description(comments)
     if description:
         context.script_metadata = ScriptMetadata(description=description)
\ No newline at end of file
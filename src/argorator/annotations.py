@@ -1,65 +1,78 @@
 """Parse Google-style annotations from shell script comments."""
 import re
-import parsy
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Sequence, Tuple
 
+from .caching import parse_cache
 from .models import ArgumentAnnotation
 
+# The annotation patterns use optional groups and lazy quantifiers, which the
+# backtracking re engine can handle poorly on long comment lines. When the
+# optional google-re2 package is installed its linear-time engine is used.
+try:
+    import re2 as _annotation_re
+except ImportError:  # pragma: no cover - depends on optional dependency
+    _annotation_re = re
 
-class CommentParser:
-    """Parser for shell script comments using parsy."""
-    
-    def __init__(self):
-        self._setup_grammar()
-    
-    def _setup_grammar(self):
-        """Setup parsy grammar for comment parsing."""
-        # Basic tokens
-        self.whitespace = parsy.regex(r'\s*')
-        self.optional_whitespace = parsy.regex(r'\s*')
-        self.required_whitespace = parsy.regex(r'\s+')
-        
-        # Comment start patterns
-        self.hash = parsy.string('#')
-        
-        # Description parsing
-        # Matches: # Description: text content
-        # or: #Description: text content (no space after #)
-        description_keyword = parsy.regex(r'[Dd]escription', re.IGNORECASE)
-        colon = parsy.string(':')
-        description_text = parsy.regex(r'.+')  # Rest of the line
-        
-        self.description_pattern = parsy.seq(
-            parsy.string('#'),
-            self.optional_whitespace,
-            description_keyword,
-            self.optional_whitespace,
-            colon,
-            self.optional_whitespace,
-            description_text
-        ).combine(lambda _, __, ___, ____, _____, ______, desc: desc.strip())
-    
-    def parse_description(self, script_text: str) -> Optional[str]:
-        """Parse script description from comments."""
-        lines = script_text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line.startswith('#'):
-                continue
-                
-            try:
-                # Try to parse this line as a description
-                result = self.description_pattern.parse(line)
-                return result
-            except parsy.ParseError:
-                continue
-        
-        return None
-
-
-# Global parser instance
-_comment_parser = CommentParser()
+# Body of every "#" comment line (leading whitespace allowed, newline excluded)
+COMMENT_LINE_PATTERN = re.compile(r'^[^\S\n]*#([^\n]*)', re.MULTILINE)
+
+# "Description: text" in a comment body; the keyword is case-insensitive
+DESCRIPTION_PATTERN = re.compile(r'description\s*:\s*(.+)', re.IGNORECASE)
+
+# Type keywords accepted in annotations (lowercase) -> canonical type name
+TYPE_NAMES: Mapping[str, str] = MappingProxyType({
+    'bool': 'bool',
+    'int': 'int',
+    'float': 'float',
+    'str': 'str',
+    'string': 'str',
+    'choice': 'choice',
+    'file': 'file',
+})
+_TYPE_ALTERNATION = '|'.join(TYPE_NAMES)
+
+# Pattern for Google-style docstring annotations
+# Matches: VAR_NAME (type) [alias: -x]: description. Default: value
+# or: VAR_NAME (choice[opt1, opt2]): description
+# or: VAR_NAME: description
+ANNOTATION_PATTERN = _annotation_re.compile(
+    r'^'  # Only keywords are case-insensitive; scoped (?i:) works in re and re2
+    r'(?P<name>[A-Za-z_][A-Za-z0-9_]*)'  # Variable name (any case)
+    r'(?:\s*\('  # Optional type section
+    r'(?P<type>(?i:' + _TYPE_ALTERNATION + r'))'  # Type
+    r'(?:\[(?P<choices>[^\]]+)\])?'  # Optional choices for choice type
+    r'\))?'
+    r'(?:\s*\[(?i:alias):(?P<alias>[^\]]+)\])?'  # Optional alias (stripped later)
+    r'\s*:'  # Colon separator; the description is stripped later
+    r'(?P<description>[^.]*?)' # Description (up to period, can be empty)
+    r'(?:\.\s*(?i:default):(?P<default>.*?))?'  # Optional default value (rest of line, can be empty)
+    r'$'  # End of line
+)
+
+# Also try a pattern for descriptions that end with a period (no default)
+ANNOTATION_NO_DEFAULT_PATTERN = _annotation_re.compile(
+    r'^'
+    r'(?P<name>[A-Za-z_][A-Za-z0-9_]*)'  # Variable name (any case)
+    r'(?:\s*\('  # Optional type section
+    r'(?P<type>(?i:' + _TYPE_ALTERNATION + r'))'  # Type
+    r'(?:\[(?P<choices>[^\]]+)\])?'  # Optional choices for choice type
+    r'\))?'
+    r'(?:\s*\[(?i:alias):(?P<alias>[^\]]+)\])?'  # Optional alias (stripped later)
+    r'\s*:'  # Colon separator; the description is stripped later
+    r'(?P<description>.*\.)$'  # Description ending with period (no default)
+)
+
+# Type and alias sections need "(" or "["; lines without either (the usual
+# "VAR: description" shape) are matched by these lighter variants instead
+SIMPLE_ANNOTATION_PATTERN = _annotation_re.compile(
+    r'^(?P<name>[A-Za-z_][A-Za-z0-9_]*)\s*:'
+    r'(?P<description>[^.]*?)'
+    r'(?:\.\s*(?i:default):(?P<default>.*?))?$'
+)
+SIMPLE_ANNOTATION_NO_DEFAULT_PATTERN = _annotation_re.compile(
+    r'^(?P<name>[A-Za-z_][A-Za-z0-9_]*)\s*:(?P<description>.*\.)$'
+)
 
 
 def parse_arg_annotations(script_text: str) -> Dict[str, ArgumentAnnotation]:
@@ -80,101 +93,79 @@ def parse_arg_annotations(script_text: str) -> Dict[str, ArgumentAnnotation]:
 	Returns:
 		Dict mapping variable names to ArgumentAnnotation models
 	"""
+	return parse_comment_annotations(extract_comments(script_text))
+
+
+@parse_cache
+def extract_comments(script_text: str) -> Tuple[str, ...]:
+	"""Return the stripped body of every "#" comment line, in script order.
+	
+	Memoized, so the description read for --help and the later annotation
+	analysis of the same script share one pass over the text.
+	"""
+	if '#' not in script_text:
+		return ()
+	# Only comment lines can hold annotations; pull their bodies out in one pass
+	return tuple(comment.strip() for comment in COMMENT_LINE_PATTERN.findall(script_text))
+
+
+def parse_comment_annotations(comments: Sequence[str]) -> Dict[str, ArgumentAnnotation]:
+	"""Parse annotations from comment bodies returned by extract_comments.
+	
+	Lets callers that already extracted the comments skip rescanning the script.
+	Results are memoized on the comments; annotations are frozen, so only the
+	dict is copied per call.
+	"""
+	return dict(_comment_annotations(tuple(comments)))
+
+
+@parse_cache
+def _comment_annotations(comments: Tuple[str, ...]) -> Tuple[Tuple[str, ArgumentAnnotation], ...]:
 	annotations = {}
 	
-	# Process line by line to avoid regex issues with multiline matching
-	lines = script_text.split('\n')
+	# Bind the matchers and type table once rather than on every line
+	typed_match = ANNOTATION_PATTERN.match
+	typed_no_default_match = ANNOTATION_NO_DEFAULT_PATTERN.match
+	simple_match = SIMPLE_ANNOTATION_PATTERN.match
+	simple_no_default_match = SIMPLE_ANNOTATION_NO_DEFAULT_PATTERN.match
+	type_names = TYPE_NAMES
 	
-	for line in lines:
-		line = line.strip()
-		if not line.startswith('#'):
+	for line in comments:
+		# Every annotation form has a colon; most ordinary comments do not
+		if ':' not in line:
 			continue
-			
-		# Remove the # and any leading whitespace
-		line = line[1:].strip()
-		
-		# Pattern for Google-style docstring annotations
-		# Matches: VAR_NAME (type) [alias: -x]: description. Default: value
-		# or: VAR_NAME (choice[opt1, opt2]): description
-		# or: VAR_NAME: description
-		pattern = re.compile(
-			r'^'
-			r'([A-Za-z_][A-Za-z0-9_]*)'  # Variable name (any case)
-			r'(?:\s*\('  # Optional type section
-			r'(bool|int|float|str|string|choice|file)'  # Type
-			r'(?:\[([^\]]+)\])?'  # Optional choices for choice type
-			r'\))?'
-			r'(?:\s*\[alias:\s*([^\]]+)\])?'  # Optional alias
-			r'\s*:\s*'  # Colon separator
-			r'([^.]*?)' # Description (up to period, can be empty)
-			r'(?:\.\s*[Dd]efault:\s*(.*?))?'  # Optional default value (rest of line, can be empty)
-			r'$',  # End of line
-			re.IGNORECASE
-		)
 		
-		# Also try a pattern for descriptions that end with a period (no default)
-		pattern_no_default = re.compile(
-			r'^'
-			r'([A-Za-z_][A-Za-z0-9_]*)'  # Variable name (any case)
-			r'(?:\s*\('  # Optional type section
-			r'(bool|int|float|str|string|choice|file)'  # Type
-			r'(?:\[([^\]]+)\])?'  # Optional choices for choice type
-			r'\))?'
-			r'(?:\s*\[alias:\s*([^\]]+)\])?'  # Optional alias
-			r'\s*:\s*'  # Colon separator
-			r'(.*\.)$',  # Description ending with period (no default)
-			re.IGNORECASE
-		)
-		
-		match = pattern.match(line)
-		if not match:
-			# Try the pattern for descriptions ending with period (no default)
-			match = pattern_no_default.match(line)
-			if not match:
-				continue
-			# For the no-default pattern, we only have 5 groups
-			var_name = match.group(1).upper()  # Normalize to uppercase for shell variables
-			var_type = match.group(2) or 'str'
-			choices_str = match.group(3)
-			alias = match.group(4)
-			description = match.group(5).strip()
-			default = None
+		# Fall back to the pattern for descriptions ending with period (no default)
+		if '(' in line or '[' in line:
+			match = typed_match(line) or typed_no_default_match(line)
 		else:
-			var_name = match.group(1).upper()  # Normalize to uppercase for shell variables
-			var_type = match.group(2) or 'str'
-			choices_str = match.group(3)
-			alias = match.group(4)
-			description = match.group(5).strip()
-			default = match.group(6)
+			match = simple_match(line) or simple_no_default_match(line)
+		if not match:
+			continue
 		
-		# Normalize type
-		if var_type.lower() in ('string', 'str'):
-			var_type = 'str'
-		else:
-			var_type = var_type.lower()
+		get = match.groupdict().get
+		var_name = get('name').upper()  # Normalize to uppercase for shell variables
+		choices_str = get('choices')
+		alias = get('alias')
+		description = get('description').strip()
+		default = get('default')
 		
-		# Build annotation data
-		annotation_data = {
-			'type': var_type,
-			'help': description
-		}
+		# Normalize type; the keyword is matched case-insensitively
+		var_type = type_names[(get('type') or 'str').lower()]
 		
-		if var_type == 'choice' and choices_str:
-			annotation_data['choices'] = [c.strip() for c in choices_str.split(',')]
-			
+		# Handle empty default values (e.g., "Default: " with no value)
 		if default is not None:
-			# Handle empty default values (e.g., "Default: " with no value)
-			default_value = default.strip()
-			if default_value:
-				annotation_data['default'] = default_value
-			
-		if alias:
-			annotation_data['alias'] = alias.strip()
+			default = default.strip() or None
 		
-		# Create ArgumentAnnotation model
-		annotations[var_name] = ArgumentAnnotation(**annotation_data)
+		annotations[var_name] = ArgumentAnnotation(
+			type=var_type,
+			help=description,
+			default=default,
+			alias=alias.strip() if alias else None,
+			choices=tuple(c.strip() for c in choices_str.split(',')) if var_type == 'choice' and choices_str else None,
+		)
 	
-	return annotations
+	return tuple(annotations.items())
 
 
 def parse_script_description(script_text: str) -> Optional[str]:
@@ -190,4 +181,13 @@ def parse_script_description(script_text: str) -> Optional[str]:
 	Returns:
 		Script description string if found, None otherwise
 	"""
-	return _comment_parser.parse_description(script_text)
\ No newline at end of file
+	return parse_comment_description(extract_comments(script_text))
+
+
+def parse_comment_description(comments: Sequence[str]) -> Optional[str]:
+	"""Return the first description among comment bodies from extract_comments."""
+	for comment in comments:
+		match = DESCRIPTION_PATTERN.match(comment)
+		if match:
+			return match.group(1).strip()
+	return None
@@ -0,0 +1,17 @@
+"""Memoization helpers shared by the script parsing modules."""
+import os
+from functools import lru_cache
+
+# Set ARGORATOR_PARSE_CACHE=0 to disable memoization of the parse functions
+PARSE_CACHE_ENABLED = os.environ.get("ARGORATOR_PARSE_CACHE", "1") != "0"
+
+
+def parse_cache(func):
+    """Memoize a pure parse function on its (hashable) input.
+
+    Cached functions must return immutable values; public wrappers hand out
+    mutable copies so callers cannot corrupt the cache.
+    """
+    if not PARSE_CACHE_ENABLED:
+        return func
+    return lru_cache(maxsize=128)(func)
@@ -2,10 +2,11 @@
 
 This module contains compiler functions that modify shell scripts by injecting
 variable assignments, transforming to echo mode, or generating export lines.
-All compilers use the decorator pattern and operate on the PipelineContext.
+All compilers use the decorator pattern and operate on the CompileContext.
 """
 import re
 import shlex
+from functools import lru_cache
 from typing import Dict, List
 
 from .contexts import CompileContext
@@ -13,29 +14,25 @@ from .registry import compiler
 from .macros.processor import macro_processor
 
 
+SHEBANG_PATTERN = re.compile(r"#![^\n]*\n?")
+INJECTED_ASSIGNMENT_PATTERN = re.compile(r"\s*[A-Za-z_][A-Za-z0-9_]*=")
+
+
+@lru_cache(maxsize=4096)
+def quote_value(value: str) -> str:
+    """Shell-quote a value, memoizing results for values that recur across compiles."""
+    return shlex.quote(value)
+
+
 @compiler(order=5)
 def process_iteration_macros(context: CompileContext) -> None:
     """Process iteration macros and transform them into bash loops."""
     try:
-        # Extract variable types from annotations and pass to macro processor
-        variable_types = {}
-        
-        # Get types from argument annotations (if available)
-        if context.annotations:
-            for var_name, annotation in context.annotations.items():
-                variable_types[var_name] = annotation.type
-        
-        # Set variable types in macro processor
-        macro_processor.set_variable_types(variable_types)
+        # Pass variable types from annotations to the macro processor
+        macro_processor.set_annotation_types(context.annotations)
         
-        # Validate macros first
-        errors = macro_processor.validate_macros(context.script_text)
-        if errors:
-            error_msg = "\n".join(errors)
-            raise ValueError(f"Macro validation failed:\n{error_msg}")
-        
-        # Process macros
-        context.script_text = macro_processor.process_macros(context.script_text)
+        # Validate and process macros in one parse
+        context.script_text = macro_processor.compile_macros(context.script_text)
         
     except Exception as e:
         raise ValueError(f"Macro processing failed: {e}")
@@ -48,11 +45,12 @@ def collect_variable_assignments(context: CompileContext) -> None:
         return
     
     assignments: Dict[str, str] = {}
-    undefined_vars = sorted(context.undefined_vars.keys())
+    # Plain dict lookups instead of attribute access on the Namespace
+    parsed = vars(context.parsed_args)
     
     # Process undefined variables (required args)
-    for name in undefined_vars:
-        value = getattr(context.parsed_args, name, None)
+    for name in context.undefined_vars:
+        value = parsed.get(name)
         if value is None:
             raise ValueError(f"Missing required --{name}")
         # Convert boolean values to lowercase string for shell compatibility
@@ -63,7 +61,7 @@ def collect_variable_assignments(context: CompileContext) -> None:
     
     # Process environment variables (optional args with defaults)
     for name, env_value in context.env_vars.items():
-        value = getattr(context.parsed_args, name, env_value)
+        value = parsed.get(name, env_value)
         # Convert boolean values to lowercase string for shell compatibility
         if isinstance(value, bool):
             assignments[name] = "true" if value else "false"
@@ -80,16 +78,16 @@ def collect_positional_values(context: CompileContext) -> None:
         return
     
     positional_values: List[str] = []
+    parsed = vars(context.parsed_args)
     
     for index in sorted(context.positional_indices):
-        attr = f"ARG{index}"
-        value = getattr(context.parsed_args, attr, None)
+        value = parsed.get(f"ARG{index}")
         if value is None:
             raise ValueError(f"Missing positional argument ${index}")
         positional_values.append(str(value))
     
     if context.varargs:
-        positional_values.extend([str(v) for v in getattr(context.parsed_args, "ARGS", [])])
+        positional_values.extend([str(v) for v in parsed.get("ARGS", [])])
     
     context.positional_values = positional_values
 
@@ -100,16 +98,17 @@ def inject_variable_assignments(context: CompileContext) -> None:
     script_text = context.script_text
     assignments = context.variable_assignments
     
-    lines = script_text.splitlines()
     injection_lines = ["# argorator: injected variable definitions"]
-    for name in sorted(assignments.keys()):
-        value = assignments[name]
-        injection_lines.append(f"{name}={shlex.quote(value)}")
+    injection_lines.extend([f"{name}={quote_value(assignments[name])}" for name in sorted(assignments)])
     injection_block = "\n".join(injection_lines) + "\n"
     
-    if lines and lines[0].startswith("#!"):
-        modified_text = (lines[0] + "\n" + injection_block + "\n".join(lines[1:]) + 
-               ("\n" if script_text.endswith("\n") else ""))
+    # Insert right after the shebang (if any) without splitting the whole script
+    shebang = SHEBANG_PATTERN.match(script_text)
+    if shebang:
+        head = shebang.group(0)
+        if not head.endswith("\n"):
+            head += "\n"
+        modified_text = head + injection_block + script_text[shebang.end():]
     else:
         modified_text = injection_block + script_text
     
@@ -140,29 +139,24 @@ def transform_script_to_echo_mode(context: CompileContext) -> None:
         while idx < len(lines):
             line = lines[idx]
             # Keep variable assignment lines (NAME=...)
-            if re.match(r"^\s*[A-Za-z_][A-Za-z0-9_]*=", line):
+            if INJECTED_ASSIGNMENT_PATTERN.match(line):
                 result_lines.append(line)
                 idx += 1
                 continue
             break
 
     # Process the rest: echo each non-empty, non-comment line
-    while idx < len(lines):
-        line = lines[idx]
-        # Preserve exact blank lines
-        if line.strip() == "":
-            result_lines.append(line)
-            idx += 1
-            continue
-        # Keep pure comment lines as-is (not echoed)
-        if line.lstrip().startswith("#"):
-            result_lines.append(line)
-            idx += 1
+    append = result_lines.append
+    for line in lines[idx:]:
+        # One lstrip serves both checks: blank lines and pure comment lines are
+        # kept exactly as-is (not echoed)
+        stripped = line.lstrip()
+        if not stripped or stripped[0] == "#":
+            append(line)
             continue
         # Escape backslashes and double quotes so we can wrap with double quotes.
         escaped = line.replace("\\", "\\\\").replace('"', '\\"')
-        result_lines.append(f'echo "{escaped}"')
-        idx += 1
+        append(f'echo "{escaped}"')
 
     # Ensure trailing newline behavior matches input
     context.compiled_script = "\n".join(result_lines) + ("\n" if script_text.endswith("\n") else "")
@@ -173,8 +167,4 @@ def generate_export_lines(assignments: Dict[str, str]) -> str:
 
     Format: export VAR='value'
     """
-    lines = []
-    for name in sorted(assignments.keys()):
-        value = assignments[name]
-        lines.append(f"export {name}={shlex.quote(value)}")
-    return "\n".join(lines)
\ No newline at end of file
+    return "\n".join([f"export {name}={quote_value(assignments[name])}" for name in sorted(assignments)])
\ No newline at end of file
@@ -4,140 +4,156 @@ Each context contains only the fields needed for its specific stage,
 enforcing separation of concerns and type safety.
 """
 import argparse
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Any
 
-from pydantic import BaseModel, Field, ConfigDict, field_validator
-
 from .models import ArgumentAnnotation, ScriptMetadata
 
 
-class BaseContext(BaseModel):
-    """Base class for all pipeline contexts."""
-    pass
+def _check_positional_indices(indices: Set[int]) -> None:
+    """Validate that positional indices are positive."""
+    if any(idx <= 0 for idx in indices):
+        raise ValueError("Positional indices must be positive")
+
+
+def _check_exit_code(exit_code: int) -> None:
+    """Validate that an exit code is in the shell's 0-255 range."""
+    if not (0 <= exit_code <= 255):
+        raise ValueError("Exit code must be between 0 and 255")
+
+
+# Checked on every assignment, including the ones made by the dataclass __init__
+_FIELD_CHECKS = {
+    "positional_indices": _check_positional_indices,
+    "exit_code": _check_exit_code,
+}
+
+
+class BaseContext:
+    """Base class for all pipeline contexts.
+    
+    Contexts are plain dataclasses: they only carry data produced by our own
+    pipeline steps, so pydantic validation bought nothing but per-instance and
+    import-time cost. Assigning a name that is not a declared field still
+    raises, so misspelled attributes fail loudly, and positional_indices and
+    exit_code are range-checked whenever they are set.
+    """
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in self.__dataclass_fields__:
+            raise AttributeError(f"{type(self).__name__!r} object has no field {name!r}")
+        check = _FIELD_CHECKS.get(name)
+        if check is not None:
+            check(value)
+        object.__setattr__(self, name, value)
 
 
+@dataclass
 class AnalysisContext(BaseContext):
     """Context for the analysis stage - script analysis only."""
-    model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=True, extra='forbid')
 
     # INPUTS: What analysis needs
-    script_text: str = Field(description="Content of the script file")
-    script_path: Optional[Path] = Field(default=None, description="Path to the script file")
-    command: str = Field(default="", description="The command to execute (run/compile/export)")
+    script_text: str  # Content of the script file
+    script_path: Optional[Path] = None  # Path to the script file
+    command: str = ""  # The command to execute (run/compile/export)
 
     # OUTPUTS: What analysis produces
-    shell_cmd: List[str] = Field(default_factory=list, description="Shell command for execution")
-    all_used_vars: Set[str] = Field(default_factory=set, description="All variables referenced in script")
-    defined_vars: Set[str] = Field(default_factory=set, description="Variables defined within script")
-    loop_vars: Set[str] = Field(default_factory=set, description="Variables defined in loop constructs")
-    undefined_vars: Dict[str, Optional[str]] = Field(default_factory=dict, description="Variables not defined in script")
-    env_vars: Dict[str, str] = Field(default_factory=dict, description="Variables with environment defaults")
-    positional_indices: Set[int] = Field(default_factory=set, description="Positional parameter indices used")
-    varargs: bool = Field(default=False, description="Whether script uses varargs ($@ or $*)")
-    annotations: Dict[str, ArgumentAnnotation] = Field(default_factory=dict, description="Parsed annotations")
-    script_metadata: Optional[ScriptMetadata] = Field(default=None, description="Script-level metadata from comments")
+    shell_cmd: List[str] = field(default_factory=list)  # Shell command for execution
+    all_used_vars: Set[str] = field(default_factory=set)  # All variables referenced in script
+    defined_vars: Set[str] = field(default_factory=set)  # Variables defined within script
+    loop_vars: Set[str] = field(default_factory=set)  # Variables defined in loop constructs
+    undefined_vars: Dict[str, Optional[str]] = field(default_factory=dict)  # Variables not defined in script
+    env_vars: Dict[str, str] = field(default_factory=dict)  # Variables with environment defaults
+    positional_indices: Set[int] = field(default_factory=set)  # Positional parameter indices used
+    varargs: bool = False  # Whether script uses varargs ($@ or $*)
+    annotations: Dict[str, ArgumentAnnotation] = field(default_factory=dict)  # Parsed annotations
+    script_metadata: Optional[ScriptMetadata] = None  # Script-level metadata from comments
 
     # Temporary data for pipeline steps
-    temp_data: Dict[str, Any] = Field(default_factory=dict, description="Temporary data for pipeline steps")
+    temp_data: Dict[str, Any] = field(default_factory=dict)
 
     def get_script_name(self) -> Optional[str]:
         """Get the script name for display purposes (without extension)."""
         return self.script_path.stem if self.script_path else None
 
-    @field_validator('positional_indices')
-    @classmethod
-    def validate_positional_indices(cls, v: Set[int]) -> Set[int]:
-        """Validate that positional indices are positive."""
-        if any(idx <= 0 for idx in v):
-            raise ValueError("Positional indices must be positive")
-        return v
-
 
+@dataclass
 class TransformContext(BaseContext):
     """Context for the transform stage - parser building only."""
-    model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=True, extra='forbid')
 
     # INPUTS: Analysis results needed for parser building
-    undefined_vars: Dict[str, Optional[str]] = Field(default_factory=dict, description="Variables not defined in script")
-    env_vars: Dict[str, str] = Field(default_factory=dict, description="Variables with environment defaults")
-    positional_indices: Set[int] = Field(default_factory=set, description="Positional parameter indices used")
-    varargs: bool = Field(default=False, description="Whether script uses varargs ($@ or $*)")
-    annotations: Dict[str, ArgumentAnnotation] = Field(default_factory=dict, description="Parsed annotations")
-    script_metadata: Optional[ScriptMetadata] = Field(default=None, description="Script-level metadata from comments")
-    script_path: Optional[Path] = Field(default=None, description="Path to the script file")  # For parser name
+    undefined_vars: Dict[str, Optional[str]] = field(default_factory=dict)  # Variables not defined in script
+    env_vars: Dict[str, str] = field(default_factory=dict)  # Variables with environment defaults
+    positional_indices: Set[int] = field(default_factory=set)  # Positional parameter indices used
+    varargs: bool = False  # Whether script uses varargs ($@ or $*)
+    annotations: Dict[str, ArgumentAnnotation] = field(default_factory=dict)  # Parsed annotations
+    script_metadata: Optional[ScriptMetadata] = None  # Script-level metadata from comments
+    script_path: Optional[Path] = None  # Path to the script file, for the parser name
 
     # OUTPUTS: What transform produces
-    argument_parser: Optional[argparse.ArgumentParser] = Field(default=None, description="Built argument parser")
+    argument_parser: Optional[argparse.ArgumentParser] = None  # Built argument parser
 
     # Temporary data for pipeline steps
-    temp_data: Dict[str, Any] = Field(default_factory=dict, description="Temporary data for pipeline steps")
+    temp_data: Dict[str, Any] = field(default_factory=dict)
 
     def get_script_name(self) -> Optional[str]:
         """Get the script name for display purposes (without extension)."""
         return self.script_path.stem if self.script_path else None
 
 
+@dataclass
 class ValidateContext(BaseContext):
     """Context for the validate stage - argument validation and transformation only."""
-    model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=True, extra='forbid')
 
     # INPUTS: Parser and parsed args for validation
-    argument_parser: Optional[argparse.ArgumentParser] = Field(default=None, description="Built argument parser")
-    parsed_args: Optional[argparse.Namespace] = Field(default=None, description="Parsed command line arguments")
+    argument_parser: Optional[argparse.ArgumentParser] = None  # Built argument parser
+    parsed_args: Optional[argparse.Namespace] = None  # Parsed command line arguments
 
     # OUTPUTS: None (validation modifies parsed_args in place)
     # Temporary data for pipeline steps
-    temp_data: Dict[str, Any] = Field(default_factory=dict, description="Temporary data for pipeline steps")
+    temp_data: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
 class CompileContext(BaseContext):
     """Context for the compile stage - script compilation only."""
-    model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=True, extra='forbid')
 
     # INPUTS: Script and arguments needed for compilation
-    script_text: str = Field(description="Content of the script file")
-    parsed_args: Optional[argparse.Namespace] = Field(default=None, description="Parsed command line arguments")
-    echo_mode: bool = Field(default=False, description="Whether to run in echo mode")
-    positional_indices: Set[int] = Field(default_factory=set, description="Positional parameter indices used")
-    varargs: bool = Field(default=False, description="Whether script uses varargs ($@ or $*)")
+    script_text: str  # Content of the script file
+    parsed_args: Optional[argparse.Namespace] = None  # Parsed command line arguments
+    echo_mode: bool = False  # Whether to run in echo mode
+    positional_indices: Set[int] = field(default_factory=set)  # Positional parameter indices used
+    varargs: bool = False  # Whether script uses varargs ($@ or $*)
     
     # Variable information needed for compilation
-    undefined_vars: Dict[str, Optional[str]] = Field(default_factory=dict, description="Variables not defined in script")
-    env_vars: Dict[str, str] = Field(default_factory=dict, description="Variables with environment defaults")
-    annotations: Dict[str, ArgumentAnnotation] = Field(default_factory=dict, description="Parsed argument annotations")
+    undefined_vars: Dict[str, Optional[str]] = field(default_factory=dict)  # Variables not defined in script
+    env_vars: Dict[str, str] = field(default_factory=dict)  # Variables with environment defaults
+    annotations: Dict[str, ArgumentAnnotation] = field(default_factory=dict)  # Parsed argument annotations
 
     # OUTPUTS: What compile produces
-    compiled_script: str = Field(default="", description="Compiled script with injected variables")
-    variable_assignments: Dict[str, str] = Field(default_factory=dict, description="Resolved variable assignments")
-    positional_values: List[str] = Field(default_factory=list, description="Positional argument values")
+    compiled_script: str = ""  # Compiled script with injected variables
+    variable_assignments: Dict[str, str] = field(default_factory=dict)  # Resolved variable assignments
+    positional_values: List[str] = field(default_factory=list)  # Positional argument values
 
     # Temporary data for pipeline steps
-    temp_data: Dict[str, Any] = Field(default_factory=dict, description="Temporary data for pipeline steps")
+    temp_data: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
 class ExecuteContext(BaseContext):
     """Context for the execute stage - script execution only."""
-    model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=True, extra='forbid')
 
     # INPUTS: Everything needed for execution
-    compiled_script: str = Field(description="Compiled script with injected variables")
-    shell_cmd: List[str] = Field(default_factory=list, description="Shell command for execution")
-    positional_values: List[str] = Field(default_factory=list, description="Positional argument values")
+    compiled_script: str  # Compiled script with injected variables
+    shell_cmd: List[str] = field(default_factory=list)  # Shell command for execution
+    positional_values: List[str] = field(default_factory=list)  # Positional argument values
 
     # OUTPUTS: What execute produces
-    exit_code: int = Field(default=0, description="Exit code from execution")
+    exit_code: int = 0  # Exit code from execution
 
     # Temporary data for pipeline steps
-    temp_data: Dict[str, Any] = Field(default_factory=dict, description="Temporary data for pipeline steps")
-
-    @field_validator('exit_code')
-    @classmethod
-    def validate_exit_code(cls, v: int) -> int:
-        """Validate that exit code is within reasonable range."""
-        if not (0 <= v <= 255):
-            raise ValueError("Exit code must be between 0 and 255")
-        return v
+    temp_data: Dict[str, Any] = field(default_factory=dict)
 
 
 # Context transition functions
@@ -155,10 +171,13 @@ def create_transform_context(analysis: AnalysisContext) -> TransformContext:
     )
 
 
-def create_validate_context(transform: TransformContext, parsed_args: argparse.Namespace) -> ValidateContext:
-    """Create a ValidateContext from TransformContext and parsed args."""
+def create_validate_context(transform: Optional[TransformContext], parsed_args: argparse.Namespace) -> ValidateContext:
+    """Create a ValidateContext from TransformContext and parsed args.
+    
+    transform may be None when the script needs no argument parser.
+    """
     return ValidateContext(
-        argument_parser=transform.argument_parser,
+        argument_parser=transform.argument_parser if transform else None,
         parsed_args=parsed_args
     )
 
@@ -3,8 +3,11 @@
 This module handles the execution of compiled shell scripts with proper
 argument passing and shell detection using the decorator pattern.
 """
-import subprocess
+import os
+import signal
+import stat
 from pathlib import Path
+from typing import List
 
 from .contexts import ExecuteContext
 from .registry import executor
@@ -14,11 +17,51 @@ from .registry import executor
 def execute_script(context: ExecuteContext) -> None:
     """Execute the compiled script with shell and positional arguments."""
     cmd = list(context.shell_cmd) + ["-s", "--"] + context.positional_values
-    process = subprocess.Popen(cmd, stdin=subprocess.PIPE, text=True)
-    assert process.stdin is not None
-    process.stdin.write(context.compiled_script)
-    process.stdin.close()
-    context.exit_code = process.wait()
+    if hasattr(os, "posix_spawn"):
+        returncode = spawn_script_with_stdin(cmd, context.compiled_script)
+    else:
+        # Imported here: POSIX systems never reach the Popen fallback
+        import subprocess
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        process.communicate(context.compiled_script.encode("utf-8"))
+        returncode = process.returncode
+    # A shell killed by signal N reports -N; report 128+N as shells do
+    context.exit_code = 128 - returncode if returncode < 0 else returncode
+
+
+def spawn_script_with_stdin(cmd: List[str], script: str) -> int:
+    """Run cmd with script piped to its stdin and return the exit code.
+    
+    posix_spawn skips the bookkeeping subprocess.Popen does around fork/exec.
+    The child gets default SIGPIPE/SIGXFSZ handling like Popen gives it.
+    """
+    read_fd, write_fd = os.pipe()
+    try:
+        file_actions = [(os.POSIX_SPAWN_DUP2, read_fd, 0)]
+        pid = os.posix_spawn(
+            cmd[0], cmd, os.environ,
+            file_actions=file_actions,
+            setsigdef=(signal.SIGPIPE, signal.SIGXFSZ),
+        )
+    except BaseException:
+        os.close(write_fd)
+        raise
+    finally:
+        os.close(read_fd)
+    # Encode once and write the raw bytes; os.write releases the GIL while the
+    # pipe drains
+    data = memoryview(script.encode("utf-8"))
+    try:
+        while data:
+            data = data[os.write(write_fd, data):]
+    except BrokenPipeError:
+        # The shell stopped reading (e.g. the script exits early); its exit
+        # status is what matters, as with Popen.communicate
+        pass
+    finally:
+        os.close(write_fd)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
 
 
 def validate_script_path(script_arg: str) -> Path:
@@ -40,7 +83,30 @@ def validate_script_path(script_arg: str) -> Path:
         # Fallback to the provided path if resolution fails (e.g., permissions)
         pass
     
-    if not script_path.exists() or not script_path.is_file():
+    # A single stat answers both "exists" and "is a regular file"
+    try:
+        is_file = stat.S_ISREG(script_path.stat().st_mode)
+    except (OSError, ValueError):
+        is_file = False
+    if not is_file:
         raise FileNotFoundError(f"Script not found: {script_path}")
     
-    return script_path
\ No newline at end of file
+    return script_path
+
+
+def read_script_text(script_path: Path) -> str:
+    """Read a script as UTF-8 text with universal newlines.
+    
+    The file is read as raw bytes and decoded in one call, bypassing the
+    text I/O layer and its incremental decoder.
+    
+    Args:
+        script_path: Path to the script file
+        
+    Returns:
+        Script content with line endings normalized to "\\n"
+    """
+    text = script_path.read_bytes().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
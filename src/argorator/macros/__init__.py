@@ -1 +1 @@
-"""Macro processing system using parsy for accurate bash parsing."""
\ No newline at end of file
+"""Macro processing system for iteration macros in bash scripts."""
\ No newline at end of file
@@ -1,54 +1,43 @@
-"""Focused parsy parser for macro functionality only."""
-import parsy
+"""Focused parser for macro functionality only."""
 import re
 from typing import List, Optional, Tuple
 from .models import FunctionBlock, MacroComment, IterationMacro, MacroTarget
 
+# Patterns are compiled once at import instead of on every call
+_SINGLE_QUOTED_RE = re.compile(r"'[^']*'")
+_DOUBLE_QUOTED_RE = re.compile(r'"[^"]*"')
+_ITERATION_MACRO_RE = re.compile(r'for\s+\w+\s+in\s+\S+', re.IGNORECASE)
+# Cheap whole-script prefilter: every iteration macro is a "# for VAR in ..." comment
+_MACRO_MARKER_RE = re.compile(r'#\s*for\s', re.IGNORECASE)
+
+# (pattern, group holding the separator)
+_SEPARATOR_PATTERNS = [
+    # "sep X" syntax (quoted)
+    (re.compile(r'(.+?)\s+sep\s+([\'"])(.+?)\2(?:\s+|$)', re.IGNORECASE), 3),
+    # "separated by X" syntax (quoted)
+    (re.compile(r'(.+?)\s+separated\s+by\s+([\'"])(.+?)\2(?:\s+|$)', re.IGNORECASE), 3),
+    # "sep X" syntax (unquoted) - match any non-whitespace character(s)
+    (re.compile(r'(.+?)\s+sep\s+(\S+)(?:\s+|$)', re.IGNORECASE), 2),
+    # "separated by X" syntax (unquoted) - match any non-whitespace character(s)
+    (re.compile(r'(.+?)\s+separated\s+by\s+(\S+)(?:\s+|$)', re.IGNORECASE), 2),
+]
+
+# for ITERATOR in (SOURCE as TYPE) | with PARAM1 PARAM2
+_PAREN_AS_RE = re.compile(r'for\s+(\w+)\s+in\s+\(([^)]+?)\s+as\s+(\w+)\)\s*(?:\|\s*with\s+(.+))?', re.IGNORECASE)
+# for ITERATOR in SOURCE as TYPE | with PARAM1 PARAM2
+_AS_RE = re.compile(r'for\s+(\w+)\s+in\s+(.+?)\s+as\s+(\w+)\s*(?:\|\s*with\s+(.+))?', re.IGNORECASE)
+# for ITERATOR in SOURCE | with PARAM1 PARAM2
+_PLAIN_RE = re.compile(r'for\s+(\w+)\s+in\s+(.+?)(?:\|\s*with\s+(.+?))?$', re.IGNORECASE)
+
+# Function definition starts, each alone on its line:
+#   function_name() {  |  function function_name() {  |  function function_name {
+_FUNCTION_START_RE = re.compile(
+    r'\s*(?:function\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*(?:\(\))?|([a-zA-Z_][a-zA-Z0-9_]*)\s*\(\))\s*\{'
+)
+
 class MacroParser:
     """Parser focused specifically on macro processing needs."""
     
-    def __init__(self):
-        self._setup_grammar()
-    
-    def _setup_grammar(self):
-        """Setup parsy grammar for function detection."""
-        # Basic tokens
-        whitespace = parsy.regex(r'\s*')
-        identifier = parsy.regex(r'[a-zA-Z_][a-zA-Z0-9_]*')
-        
-        # Function definition patterns
-        # Pattern 1: function_name() {
-        self.function_pattern1 = parsy.seq(
-            whitespace,
-            identifier,
-            whitespace,
-            parsy.string('()'),
-            whitespace,
-            parsy.string('{')
-        ).combine(lambda _, name, __, ___, ____, _____: name)
-        
-        # Pattern 2: function function_name() {
-        self.function_pattern2 = parsy.seq(
-            whitespace,
-            parsy.string('function'),
-            parsy.regex(r'\s+'),
-            identifier,
-            whitespace,
-            parsy.string('()').optional(),
-            whitespace,
-            parsy.string('{')
-        ).combine(lambda _, __, ___, name, ____, _____, ______, _______: name)
-        
-        # Pattern 3: function function_name {
-        self.function_pattern3 = parsy.seq(
-            whitespace,
-            parsy.string('function'),
-            parsy.regex(r'\s+'),
-            identifier,
-            whitespace,
-            parsy.string('{')
-        ).combine(lambda _, __, ___, name, ____, _____: name)
-    
     def find_functions(self, script_text: str) -> List[FunctionBlock]:
         """Find all function definitions in the script."""
         lines = script_text.split('\n')
@@ -71,21 +60,9 @@ class MacroParser:
     
     def _try_parse_function_start(self, line: str) -> Optional[str]:
         """Try to parse a function definition start."""
-        try:
-            return self.function_pattern1.parse(line)
-        except:
-            pass
-        
-        try:
-            return self.function_pattern2.parse(line)
-        except:
-            pass
-        
-        try:
-            return self.function_pattern3.parse(line)
-        except:
-            pass
-        
+        match = _FUNCTION_START_RE.fullmatch(line)
+        if match:
+            return match.group(1) or match.group(2)
         return None
     
     def _find_function_end(self, lines: List[str], start_line: int) -> Optional[int]:
@@ -122,15 +99,22 @@ class MacroParser:
         # This is not perfect but good enough for most cases
         
         # Remove single-quoted strings
-        line = re.sub(r"'[^']*'", '', line)
+        line = _SINGLE_QUOTED_RE.sub('', line)
         # Remove double-quoted strings (simple version)
-        line = re.sub(r'"[^"]*"', '', line)
+        line = _DOUBLE_QUOTED_RE.sub('', line)
         
         return line.count('{') - line.count('}')
     
+    def may_contain_macros(self, script_text: str) -> bool:
+        """Return False when the script certainly has no macro comments."""
+        return _MACRO_MARKER_RE.search(script_text) is not None
+    
     def find_macro_comments(self, script_text: str) -> List[MacroComment]:
         """Find all macro annotation comments."""
-        lines = script_text.split('\n')
+        return self.find_macro_comments_in_lines(script_text.split('\n'))
+    
+    def find_macro_comments_in_lines(self, lines: List[str]) -> List[MacroComment]:
+        """Find all macro annotation comments in an already split script."""
         macros = []
         
         for i, line in enumerate(lines):
@@ -154,7 +138,7 @@ class MacroParser:
     def _detect_macro_type(self, content: str) -> Optional[str]:
         """Detect if a comment is a macro and what type."""
         # Iteration macro: for VAR in SOURCE (stricter pattern)
-        if re.match(r'for\s+\w+\s+in\s+\S+', content, re.IGNORECASE):
+        if _ITERATION_MACRO_RE.match(content):
             return 'iteration'
         
         # Future macro types can be added here
@@ -167,8 +151,10 @@ class MacroParser:
     
     def find_target_for_macro(self, script_text: str, macro_line: int) -> Optional[MacroTarget]:
         """Find what a macro applies to (function or line after it)."""
-        lines = script_text.split('\n')
-        
+        return self.find_target_for_macro_in_lines(script_text.split('\n'), macro_line)
+    
+    def find_target_for_macro_in_lines(self, lines: List[str], macro_line: int) -> Optional[MacroTarget]:
+        """Find what a macro applies to in an already split script."""
         # Skip over consecutive macro comments to find the actual target
         target_line = macro_line + 1
         while target_line < len(lines):
@@ -214,19 +200,8 @@ class MacroParser:
         processed_content = content
         
         # Check for separator syntax variations
-        separator_patterns = [
-            # "sep X" syntax (quoted)
-            (r'(.+?)\s+sep\s+([\'"])(.+?)\2(?:\s+|$)', 3),
-            # "separated by X" syntax (quoted)  
-            (r'(.+?)\s+separated\s+by\s+([\'"])(.+?)\2(?:\s+|$)', 3),
-            # "sep X" syntax (unquoted) - match any non-whitespace character(s)
-            (r'(.+?)\s+sep\s+(\S+)(?:\s+|$)', 2),
-            # "separated by X" syntax (unquoted) - match any non-whitespace character(s)
-            (r'(.+?)\s+separated\s+by\s+(\S+)(?:\s+|$)', 2),
-        ]
-        
-        for pattern, sep_group in separator_patterns:
-            sep_match = re.search(pattern, content, re.IGNORECASE)
+        for pattern, sep_group in _SEPARATOR_PATTERNS:
+            sep_match = pattern.search(content)
             if sep_match:
                 # Extract everything before the separator syntax
                 before_sep = sep_match.group(1).strip()
@@ -249,8 +224,7 @@ class MacroParser:
         # for ITERATOR in SOURCE as TYPE | with PARAM1 PARAM2
         
         # First, handle parenthesized format
-        paren_pattern = r'for\s+(\w+)\s+in\s+\(([^)]+?)\s+as\s+(\w+)\)\s*(?:\|\s*with\s+(.+))?'
-        paren_match = re.match(paren_pattern, processed_content, re.IGNORECASE)
+        paren_match = _PAREN_AS_RE.match(processed_content)
         
         if paren_match:
             iterator_var = paren_match.group(1)
@@ -262,8 +236,7 @@ class MacroParser:
         else:
             # Handle non-parenthesized format
             # First try to match with "as TYPE" 
-            as_pattern = r'for\s+(\w+)\s+in\s+(.+?)\s+as\s+(\w+)\s*(?:\|\s*with\s+(.+))?'
-            as_match = re.match(as_pattern, processed_content, re.IGNORECASE)
+            as_match = _AS_RE.match(processed_content)
             
             if as_match:
                 iterator_var = as_match.group(1)
@@ -274,8 +247,7 @@ class MacroParser:
                     additional_params = [p.strip() for p in as_match.group(4).split()]
             else:
                 # No "as TYPE", just normal format
-                pattern = r'for\s+(\w+)\s+in\s+(.+?)(?:\|\s*with\s+(.+?))?$'
-                match = re.match(pattern, processed_content, re.IGNORECASE)
+                match = _PLAIN_RE.match(processed_content)
                 
                 if not match:
                     raise ValueError(f"Invalid iteration macro syntax: {content}")
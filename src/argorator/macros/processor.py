@@ -1,7 +1,15 @@
 """Main macro processor that integrates with existing Argorator pipeline."""
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from .parser import macro_parser
 from .models import IterationMacro, MacroComment, MacroTarget
+from ..models import ArgumentAnnotation
+
+
+def _log_warning(message: str, *args) -> None:
+    """Log a warning, importing logging only when there is something to report."""
+    import logging
+    logging.getLogger(__name__).warning(message, *args)
+
 
 class MacroProcessor:
     """Main processor for macro transformations."""
@@ -14,10 +22,18 @@ class MacroProcessor:
         """Set variable type information from argument annotations."""
         self.variable_types = variable_types.copy()
     
+    def set_annotation_types(self, annotations: Dict[str, ArgumentAnnotation]) -> None:
+        """Set variable type information straight from parsed argument annotations."""
+        self.variable_types = {name: annotation.type for name, annotation in annotations.items()}
+    
     def process_macros(self, script_text: str) -> str:
         """Process all macros in the script and return transformed script."""
-        # Find all macro comments
-        macro_comments = self.parser.find_macro_comments(script_text)
+        if not self.parser.may_contain_macros(script_text):
+            return script_text
+        
+        # Split once and share the lines between comment and target lookups
+        lines = script_text.split('\n')
+        macro_comments = self.parser.find_macro_comments_in_lines(lines)
         
         if not macro_comments:
             return script_text  # No macros to process
@@ -26,7 +42,7 @@ class MacroProcessor:
         processed_macros = []
         for comment in macro_comments:
             if comment.macro_type == 'iteration':
-                target = self.parser.find_target_for_macro(script_text, comment.line_number)
+                target = self.parser.find_target_for_macro_in_lines(lines, comment.line_number)
                 if target:
                     try:
                         iteration_macro = self.parser.parse_iteration_macro(comment, target)
@@ -35,18 +51,41 @@ class MacroProcessor:
                         processed_macros.append(iteration_macro)
                     except ValueError as e:
                         # Log error but don't fail the entire process
-                        print(f"Warning: Failed to parse macro on line {comment.line_number + 1}: {e}")
+                        _log_warning("Failed to parse macro on line %d: %s", comment.line_number + 1, e)
         
         # Validate macro combinations and detect conflicts
         self._validate_macro_combinations(processed_macros)
         
         # Apply transformations
-        return self._apply_transformations(script_text, processed_macros)
+        return self._apply_transformations_to_lines(lines, processed_macros)
     
-    def _apply_transformations(self, script_text: str, macros: List[IterationMacro]) -> str:
-        """Apply macro transformations to the script."""
+    def compile_macros(self, script_text: str) -> str:
+        """Validate and transform all macros, parsing each macro only once.
+        
+        Raises:
+            ValueError: If any macro is invalid (all errors are reported together)
+                or macros are combined in an unsupported way.
+        """
+        # Most scripts have no macros; skip splitting and scanning every line
+        if not self.parser.may_contain_macros(script_text):
+            return script_text
+        
         lines = script_text.split('\n')
+        macros, errors = self._parse_iteration_macros(lines)
+        if errors:
+            error_msg = "\n".join(errors)
+            raise ValueError(f"Macro validation failed:\n{error_msg}")
         
+        if not macros:
+            return script_text
+        
+        for macro in macros:
+            self._enhance_iteration_type(macro)
+        self._validate_macro_combinations(macros)
+        return self._apply_transformations_to_lines(lines, macros)
+    
+    def _apply_transformations_to_lines(self, lines: List[str], macros: List[IterationMacro]) -> str:
+        """Apply macro transformations to an already split script."""
         # Process macros in reverse order to maintain line numbers
         for macro in sorted(macros, key=lambda m: m.comment.line_number, reverse=True):
             transformation = macro.generate_transformation()
@@ -61,9 +100,8 @@ class MacroProcessor:
             insertion_point = macro.target.end_line + 1
             transformation_lines = [''] + transformation.split('\n')
             
-            # Insert transformation
-            for i, line in enumerate(transformation_lines):
-                lines.insert(insertion_point + i, line)
+            # Insert transformation with one slice assignment instead of shifting per line
+            lines[insertion_point:insertion_point] = transformation_lines
                 
         elif macro.target.target_type == 'line':
             # Replace target line with loop
@@ -303,19 +341,25 @@ class MacroProcessor:
     
     def validate_macros(self, script_text: str) -> List[str]:
         """Validate macros and return any error messages."""
+        _, errors = self._parse_iteration_macros(script_text.split('\n'))
+        return errors
+    
+    def _parse_iteration_macros(self, lines: List[str]) -> Tuple[List[IterationMacro], List[str]]:
+        """Parse every iteration macro, collecting parsed macros and error messages."""
+        macros = []
         errors = []
-        macro_comments = self.parser.find_macro_comments(script_text)
+        macro_comments = self.parser.find_macro_comments_in_lines(lines)
         
         for comment in macro_comments:
             if comment.macro_type == 'iteration':
                 try:
-                    target = self.parser.find_target_for_macro(script_text, comment.line_number)
+                    target = self.parser.find_target_for_macro_in_lines(lines, comment.line_number)
                     if not target:
                         errors.append(f"Line {comment.line_number + 1}: No target found for macro")
                         continue
                     
                     # Try to parse the macro
-                    self.parser.parse_iteration_macro(comment, target)
+                    macros.append(self.parser.parse_iteration_macro(comment, target))
                     
                 except ValueError as e:
                     error_details = self._generate_syntax_error_help(comment, str(e))
@@ -323,15 +367,16 @@ class MacroProcessor:
                 except Exception as e:
                     errors.append(f"Line {comment.line_number + 1}: Unexpected error: {e}")
         
-        return errors
+        return macros, errors
     
     def list_macros(self, script_text: str) -> List[Dict]:
         """List all detected macros for debugging/info purposes."""
-        macro_comments = self.parser.find_macro_comments(script_text)
+        lines = script_text.split('\n')
+        macro_comments = self.parser.find_macro_comments_in_lines(lines)
         result = []
         
         for comment in macro_comments:
-            target = self.parser.find_target_for_macro(script_text, comment.line_number)
+            target = self.parser.find_target_for_macro_in_lines(lines, comment.line_number)
             macro_info = {
                 'line': comment.line_number + 1,
                 'type': comment.macro_type,
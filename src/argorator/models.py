@@ -1,54 +1,39 @@
-"""Pydantic models for argument annotations."""
-from typing import List, Literal, Optional
-from pydantic import BaseModel, Field, field_validator
+"""Models for argument annotations and the explain command output."""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field
 
 
-class ArgumentAnnotation(BaseModel):
-    """Model for a single argument annotation."""
-    
-    type: Literal['str', 'int', 'float', 'bool', 'choice', 'file'] = Field(
-        default='str',
-        description="The argument type"
-    )
-    help: str = Field(
-        default='',
-        description="Help text for the argument"
-    )
-    default: Optional[str] = Field(
-        default=None,
-        description="Default value for the argument"
-    )
-    alias: Optional[str] = Field(
-        default=None,
-        description="Short alias for the argument (e.g., '-v')"
-    )
-    choices: Optional[List[str]] = Field(
-        default=None,
-        description="Valid choices for choice type arguments"
-    )
+# Argument types an annotation may declare
+ANNOTATION_TYPES = frozenset({'str', 'int', 'float', 'bool', 'choice', 'file'})
+
+
+@dataclass(frozen=True)
+class ArgumentAnnotation:
+    """A single argument annotation.
+
+    A frozen dataclass rather than a pydantic model: one is built for every
+    annotation comment on each launch, and parsed annotations are shared by
+    the parse cache. The checks the model validators did are done inline.
+    """
     
-    @field_validator('alias')
-    @classmethod
-    def validate_alias(cls, v: Optional[str]) -> Optional[str]:
-        """Validate that alias starts with a single dash."""
-        if v is not None and not v.startswith('-'):
-            # Prepend dash if not present
-            return f'-{v}'
-        return v
+    type: str = 'str'  # One of ANNOTATION_TYPES
+    help: str = ''  # Help text for the argument
+    default: Optional[str] = None  # Default value for the argument
+    alias: Optional[str] = None  # Short alias for the argument (e.g., '-v')
+    choices: Optional[Tuple[str, ...]] = None  # Valid choices for choice type arguments
     
-    @field_validator('choices')
-    @classmethod
-    def validate_choices(cls, v: Optional[List[str]], info) -> Optional[List[str]]:
-        """Validate that choices are only set for choice type."""
-        if v is not None and info.data.get('type') != 'choice':
+    def __post_init__(self) -> None:
+        if self.choices is not None and not isinstance(self.choices, tuple):
+            # Keep cached instances immutable (and hashable) even if given a list
+            object.__setattr__(self, 'choices', tuple(self.choices))
+        if self.type not in ANNOTATION_TYPES:
+            raise ValueError(f"Unknown argument type: {self.type!r}")
+        if self.choices is not None and self.type != 'choice':
             raise ValueError("choices can only be set for type='choice'")
-        return v
-    
-    def model_post_init(self, __context) -> None:
-        """Post-initialization validation."""
-        # If choices are provided but type is not set, set type to 'choice'
-        if self.choices and self.type != 'choice':
-            self.type = 'choice'
+        if self.alias is not None and not self.alias.startswith('-'):
+            # Prepend dash if not present
+            object.__setattr__(self, 'alias', f'-{self.alias}')
 
 
 class ScriptMetadata(BaseModel):
@@ -10,6 +10,8 @@ the decorator registration system:
 6. Script execution or output generation
 """
 import argparse
+import codecs
+import os
 import sys
 from pathlib import Path
 from typing import List, Optional, Sequence, Dict, Any
@@ -21,8 +23,8 @@ from .contexts import (
     create_transform_context, create_validate_context,
     create_compile_context, create_execute_context
 )
-from .models import ScriptInterface, ArgumentInfo, PositionalInfo
-from .execution import validate_script_path
+from .models import ArgumentAnnotation, ScriptInterface, ArgumentInfo, PositionalInfo
+from .execution import read_script_text, validate_script_path
 from .registry import pipeline_registry
 from .transformers import build_top_level_parser
 
@@ -30,8 +32,41 @@ from .transformers import build_top_level_parser
 from . import analyzers, transformers, validators, compilation, execution
 
 
+# Unannotated variables are described as plain strings without help text
+_PLAIN_ANNOTATION = ArgumentAnnotation()
 
 
+def _argument_info(name: str, annotation: ArgumentAnnotation, default: Optional[str], required: bool) -> ArgumentInfo:
+    """Describe one variable argument for explain output."""
+    return ArgumentInfo(
+        name=name,
+        type=annotation.type,
+        help=annotation.help,
+        default=default,
+        required=required,
+        alias=annotation.alias,
+        choices=list(annotation.choices) if annotation.choices is not None else None
+    )
+
+
+def _write_stdout(text: str) -> None:
+    """Write text to stdout, bypassing the text layer when that is equivalent.
+    
+    For a UTF-8 stream on a platform that does not translate "\n", encoding
+    once and writing the bytes produces exactly what sys.stdout.write would;
+    any other stream goes through the text layer, honouring its encoding.
+    """
+    stream = sys.stdout
+    buffer = getattr(stream, "buffer", None)
+    encoding = getattr(stream, "encoding", None)
+    if buffer is None or not encoding or os.linesep != "\n" or codecs.lookup(encoding).name != "utf-8":
+        stream.write(text)
+        return
+    # Anything already printed must come out before the raw bytes
+    stream.flush()
+    buffer.write(text.encode(encoding, stream.errors or "strict"))
+    buffer.flush()
+
 
 class PipelineCommand:
     """Represents a command to be executed by the pipeline."""
@@ -113,9 +148,9 @@ class Pipeline:
             
             try:
                 script_path = Path(script_arg)
-                if script_path.exists() and script_path.is_file():
+                if script_path.is_file():
                     # Read the script and parse description
-                    script_text = script_path.read_text(encoding="utf-8")
+                    script_text = read_script_text(script_path)
                     # Import here to avoid circular import
                     from .annotations import parse_script_description
                     return parse_script_description(script_text)
@@ -188,7 +223,7 @@ class Pipeline:
     def create_analysis_context(self, command: PipelineCommand) -> AnalysisContext:
         """Create initial AnalysisContext from command parameters."""
         return AnalysisContext(
-            script_text=command.script_path.read_text(encoding="utf-8"),
+            script_text=read_script_text(command.script_path),
             script_path=command.script_path,
             command=command.command
         )
@@ -204,6 +239,20 @@ class Pipeline:
         self.registry.execute_stage('transform', transform)
         return transform
     
+    def needs_argument_parser(self, analysis: AnalysisContext, rest_args: List[str]) -> bool:
+        """Check whether the script exposes any CLI surface or arguments were given.
+        
+        Leftover arguments still require a parser so that --help and unknown
+        arguments are reported the usual way.
+        """
+        return bool(
+            rest_args
+            or analysis.undefined_vars
+            or analysis.env_vars
+            or analysis.positional_indices
+            or analysis.varargs
+        )
+    
     def parse_arguments(self, transform: TransformContext, rest_args: List[str]) -> argparse.Namespace:
         """Stage 3: Parse arguments to get actual values."""
         if not transform.argument_parser:
@@ -211,7 +260,7 @@ class Pipeline:
         
         return transform.argument_parser.parse_args(rest_args)
     
-    def run_validation_stage(self, transform: TransformContext, parsed_args: argparse.Namespace) -> ValidateContext:
+    def run_validation_stage(self, transform: Optional[TransformContext], parsed_args: argparse.Namespace) -> ValidateContext:
         """Stage 4: Validate and transform parsed arguments."""
         validate = create_validate_context(transform, parsed_args)
         self.registry.execute_stage('validate', validate)
@@ -245,54 +294,15 @@ class Pipeline:
         arguments = []
         
         # Add undefined variables (required arguments)
-        for name in sorted(context.undefined_vars.keys()):
-            annotation = context.annotations.get(name)
-            if annotation:
-                arg_info = ArgumentInfo(
-                    name=name,
-                    type=annotation.type,
-                    help=annotation.help,
-                    default=annotation.default,
-                    required=True,
-                    alias=annotation.alias,
-                    choices=annotation.choices
-                )
-            else:
-                arg_info = ArgumentInfo(
-                    name=name,
-                    type='str',
-                    help='',
-                    default=None,
-                    required=True,
-                    alias=None,
-                    choices=None
-                )
-            arguments.append(arg_info)
+        for name in context.undefined_vars:
+            annotation = context.annotations.get(name, _PLAIN_ANNOTATION)
+            arguments.append(_argument_info(name, annotation, annotation.default, required=True))
         
-        # Add environment variables (optional arguments)
+        # Add environment variables (optional arguments); the environment value
+        # takes precedence over any annotation default
         for name, env_value in context.env_vars.items():
-            annotation = context.annotations.get(name)
-            if annotation:
-                arg_info = ArgumentInfo(
-                    name=name,
-                    type=annotation.type,
-                    help=annotation.help,
-                    default=env_value,  # Environment value takes precedence
-                    required=False,
-                    alias=annotation.alias,
-                    choices=annotation.choices
-                )
-            else:
-                arg_info = ArgumentInfo(
-                    name=name,
-                    type='str',
-                    help='',
-                    default=env_value,
-                    required=False,
-                    alias=None,
-                    choices=None
-                )
-            arguments.append(arg_info)
+            annotation = context.annotations.get(name, _PLAIN_ANNOTATION)
+            arguments.append(_argument_info(name, annotation, env_value, required=False))
         
         # Build positionals list
         positionals = []
@@ -334,11 +344,16 @@ class Pipeline:
                 print(output)
                 return 0
             
-            # Stage 2: Build argument parser
-            transform = self.run_transform_stage(analysis)
-            
-            # Stage 3: Parse arguments
-            parsed_args = self.parse_arguments(transform, command.rest_args)
+            if self.needs_argument_parser(analysis, command.rest_args):
+                # Stage 2: Build argument parser
+                transform = self.run_transform_stage(analysis)
+                
+                # Stage 3: Parse arguments
+                parsed_args = self.parse_arguments(transform, command.rest_args)
+            else:
+                # Nothing to expose and nothing passed: skip argparse entirely
+                transform = None
+                parsed_args = argparse.Namespace()
             
             # Stage 4: Validate and transform arguments
             validate = self.run_validation_stage(transform, parsed_args)
@@ -351,10 +366,7 @@ class Pipeline:
                 output = self.generate_output(command.command, compile_ctx)
                 if output:
                     # Handle line ending consistency
-                    if command.command == "compile":
-                        print(output, end="" if output.endswith("\n") else "\n")
-                    else:
-                        print(output)
+                    _write_stdout(output if output.endswith("\n") else output + "\n")
                 return 0
             
             # Stage 6: Execute script (run command)
@@ -1,5 +1,4 @@
 """Decorator registration system for pipeline steps."""
-from functools import wraps
 from typing import Callable, Dict, List, TypeVar
 
 from .contexts import BaseContext
@@ -37,10 +36,8 @@ class PipelineRegistry:
             if not inserted:
                 self._steps[stage].append(step_info)
             
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                return func(*args, **kwargs)
-            return wrapper
+            # Hand back the step itself; a pass-through wrapper only adds a call frame
+            return func
         return decorator
     
     def execute_stage(self, stage: str, context: BaseContext) -> None:
@@ -102,8 +102,9 @@ def build_test_parser(
         script_text="",  # Not needed for parser building
         script_path=Path("test.sh"),
         command="run",
-        undefined_vars={var: None for var in undefined_vars},
-        env_vars=env_vars,
+        # Analysis hands later stages name-sorted dicts; mirror that here
+        undefined_vars=dict.fromkeys(sorted(undefined_vars)),
+        env_vars=dict(sorted(env_vars.items())),
         positional_indices=positional_indices,
         varargs=varargs,
         annotations=annotations
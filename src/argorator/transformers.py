@@ -12,6 +12,39 @@ from .models import ArgumentAnnotation
 from .registry import transformer
 
 
+_TYPE_CONVERTERS = {
+    'int': int,
+    'float': float,
+}
+
+# Strings that make a boolean default true (compared case-insensitively)
+_TRUE_VALUES = frozenset({'true', '1', 'yes', 'y'})
+
+
+def _is_true(value: str) -> bool:
+    """Return whether a boolean default string means true."""
+    # Lowercase spellings are the norm; only lower() when the fast probe misses
+    return value in _TRUE_VALUES or value.lower() in _TRUE_VALUES
+
+
+class ConflictAwareArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that appends env/annotation default conflicts to its help."""
+
+    def __init__(self, conflicts: List, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.conflicts = conflicts
+
+    def format_help(self):
+        help_text = super().format_help()
+        if self.conflicts:
+            warning_lines = ["\nWARNING: Default value conflicts detected:"]
+            for var_name, env_val, ann_val in self.conflicts:
+                warning_lines.append(f"  {var_name}: environment='{env_val}' vs annotation='{ann_val}' (using environment)")
+            warning_lines.append("")
+            help_text = help_text + "\n".join(warning_lines)
+        return help_text
+
+
 @transformer(order=10)
 def create_base_parser(context: TransformContext) -> None:
     """Create the base ArgumentParser with conflict detection."""
@@ -25,24 +58,13 @@ def create_base_parser(context: TransformContext) -> None:
             if str(env_value) != str(annotation_default):
                 conflicts.append((name, env_value, annotation_default))
     
-    # Create custom ArgumentParser to add conflict warnings to help
-    class ConflictAwareArgumentParser(argparse.ArgumentParser):
-        def format_help(self):
-            help_text = super().format_help()
-            if conflicts:
-                warning_lines = ["\nWARNING: Default value conflicts detected:"]
-                for var_name, env_val, ann_val in conflicts:
-                    warning_lines.append(f"  {var_name}: environment='{env_val}' vs annotation='{ann_val}' (using environment)")
-                warning_lines.append("")
-                help_text = help_text + "\n".join(warning_lines)
-            return help_text
-    
     # Determine description from script metadata
     description = None
     if context.script_metadata and context.script_metadata.description:
         description = context.script_metadata.description
     
     parser = ConflictAwareArgumentParser(
+        conflicts,
         add_help=True, 
         prog=context.get_script_name(),
         description=description
@@ -59,10 +81,9 @@ def add_undefined_variable_arguments(context: TransformContext) -> None:
     if not context.argument_parser:
         raise ValueError("Base parser must be created first")
     
-    undefined_vars = sorted(context.undefined_vars.keys())
     conflicts = context.temp_data.get('conflicts', [])
     
-    for name in undefined_vars:
+    for name in context.undefined_vars:
         add_variable_argument(
             context.argument_parser,
             name,
@@ -111,14 +132,15 @@ def add_positional_arguments(context: TransformContext) -> None:
         context.argument_parser.add_argument("ARGS", nargs="*")
 
 
+def _overrides_annotation(name: str, conflicts: List) -> bool:
+    """Return whether the environment value for name overrides an annotation default."""
+    return any(conflict[0] == name for conflict in conflicts)
+
+
 def get_type_converter(type_str: str):
     """Get appropriate type converter function for argument type."""
-    if type_str == 'int':
-        return int
-    elif type_str == 'float':
-        return float
-    else:  # str, string or choice
-        return str
+    # str, string, choice and file all convert as plain strings
+    return _TYPE_CONVERTERS.get(type_str, str)
 
 
 def add_variable_argument(
@@ -163,44 +185,30 @@ def add_boolean_argument(
     """Add a boolean argument to the parser."""
     if env_value is not None:
         # Environment-backed boolean
-        default_bool = env_value.lower() in ('true', '1', 'yes', 'y')
+        default_bool = _is_true(env_value)
     elif annotation.default is not None:
         # Annotation-backed boolean
-        default_bool = annotation.default.lower() in ('true', '1', 'yes', 'y')
+        default_bool = _is_true(annotation.default)
     else:
         # Required boolean defaults to False
         default_bool = False
     
-    if default_bool:
-        # Default is True, so flag should store_false
-        kwargs['action'] = 'store_false'
-        kwargs['default'] = True
-        help_parts = []
-        if annotation.help:
-            help_parts.append(annotation.help)
-        if env_value is not None:
-            if name in [c[0] for c in conflicts]:
-                help_parts.append("(default from env: true, overriding annotation)")
-            else:
-                help_parts.append(f"(default from env: {env_value})")
+    # store_false when the default is true, store_true otherwise
+    kwargs['action'] = 'store_false' if default_bool else 'store_true'
+    kwargs['default'] = default_bool
+    default_text = 'true' if default_bool else 'false'
+    
+    help_parts = []
+    if annotation.help:
+        help_parts.append(annotation.help)
+    if env_value is not None:
+        if _overrides_annotation(name, conflicts):
+            help_parts.append(f"(default from env: {default_text}, overriding annotation)")
         else:
-            help_parts.append("(default: true)")
-        kwargs['help'] = ' '.join(help_parts)
+            help_parts.append(f"(default from env: {env_value})")
     else:
-        # Default is False, so flag should store_true
-        kwargs['action'] = 'store_true'
-        kwargs['default'] = False
-        help_parts = []
-        if annotation.help:
-            help_parts.append(annotation.help)
-        if env_value is not None:
-            if name in [c[0] for c in conflicts]:
-                help_parts.append("(default from env: false, overriding annotation)")
-            else:
-                help_parts.append(f"(default from env: {env_value})")
-        else:
-            help_parts.append("(default: false)")
-        kwargs['help'] = ' '.join(help_parts)
+        help_parts.append(f"(default: {default_text})")
+    kwargs['help'] = ' '.join(help_parts)
     
     # Boolean flags are never required (they have implicit defaults)
     kwargs['required'] = False
@@ -218,25 +226,26 @@ def add_typed_argument(
     conflicts: List
 ):
     """Add a typed (non-boolean) argument to the parser."""
-    kwargs['type'] = get_type_converter(annotation.type)
+    converter = get_type_converter(annotation.type)
+    kwargs['type'] = converter
     
     if env_value is not None:
         # Environment-backed variable
-        kwargs['default'] = get_type_converter(annotation.type)(env_value)
+        kwargs['default'] = converter(env_value)
         kwargs['required'] = False
         
         # Build help text with default value info
         help_parts = []
         if annotation.help:
             help_parts.append(annotation.help)
-        if name in [c[0] for c in conflicts]:
+        if _overrides_annotation(name, conflicts):
             help_parts.append(f"(default from env: {env_value}, overriding annotation)")
         else:
             help_parts.append(f"(default from env: {env_value})")
         kwargs['help'] = ' '.join(help_parts)
     elif annotation.default is not None:
         # Annotation provides default
-        kwargs['default'] = get_type_converter(annotation.type)(annotation.default)
+        kwargs['default'] = converter(annotation.default)
         kwargs['required'] = False
         if annotation.help:
             kwargs['help'] = f"{annotation.help} (default: {annotation.default})"
@@ -249,7 +258,8 @@ def add_typed_argument(
             kwargs['help'] = annotation.help
     
     if annotation.choices:
-        kwargs['choices'] = annotation.choices
+        # A dict keeps declaration order for help while argparse's membership check hashes
+        kwargs['choices'] = dict.fromkeys(annotation.choices)
     
     parser.add_argument(*arg_names, **kwargs)
 
@@ -7,6 +7,7 @@ import pytest
 
 from argorator import cli
 from argorator.analyzers import parse_defined_variables, parse_variable_usages, parse_positional_usages
+from argorator.testing import run_pipeline_stages
 
 
 SCRIPT_SIMPLE = """#!/bin/bash
@@ -104,7 +105,7 @@ def test_implicit_run_path(tmp_path: Path):
 	assert rc == 0
 
 
-def test_help_shows_env_defaults(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys):
+def test_help_shows_env_defaults(monkeypatch: pytest.MonkeyPatch):
 	"""Test that environment variable defaults are shown in help text."""
 	# Set environment variables that will be used in the script
 	monkeypatch.setenv("HOME", "/home/testuser")
@@ -116,22 +117,15 @@ echo "Home: $HOME"
 echo "User: $USER"
 echo "Name: $NAME"
 """
-	script = write_temp_script(tmp_path, script_content)
-	
-	# Run with --help and capture output
-	rc = cli.main([str(script), "--help"])
-	
-	# Check that exit code is 0 for help
-	assert rc == 0
-	
-	# Capture the printed output
-	captured = capsys.readouterr()
+	# Build the parser directly instead of round-tripping --help through SystemExit
+	_, transform = run_pipeline_stages(script_content, [])
+	help_text = transform.argument_parser.format_help()
 	
 	# Verify that help text shows the default values from environment
-	assert "(default from env: /home/testuser)" in captured.out
-	assert "(default from env: testuser)" in captured.out
+	assert "(default from env: /home/testuser)" in help_text
+	assert "(default from env: testuser)" in help_text
 	# NAME should be required and not have a default
-	assert "--name" in captured.out
+	assert "--name" in help_text
 
 
 def test_env_annotation_default_conflicts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys):
@@ -251,4 +245,61 @@ echo "Hello $USER_NAME on port $PORT_NUMBER"
 	
 	# Run the script - should work with the annotation defaults
 	rc = cli.main([str(script)])
-	assert rc == 0
\ No newline at end of file
+	assert rc == 0
+
+
+def test_cli_entry_restores_default_sigpipe_for_the_script(tmp_path: Path):
+	"""Test that the script's shell does not inherit Python's ignored SIGPIPE."""
+	script = write_temp_script(tmp_path, "yes | head -n1\n")
+	src_path = Path(__file__).parent.parent / "src"
+	env = dict(os.environ, PYTHONPATH=str(src_path))
+	result = subprocess.run(
+		[sys.executable, "-m", "argorator.cli", str(script)],
+		capture_output=True,
+		text=True,
+		env=env,
+	)
+	assert result.returncode == 0
+	assert result.stdout == "y\n"
+	assert result.stderr == ""
+
+
+def test_script_without_arguments_skips_parser_but_rejects_extras(tmp_path: Path, capsys):
+	"""Test that a script with no variables compiles without a parser but still rejects unknown options."""
+	script = write_temp_script(tmp_path, "#!/bin/bash\necho static\n")
+	assert cli.main(["compile", str(script)]) == 0
+	assert capsys.readouterr().out == "#!/bin/bash\n# argorator: injected variable definitions\necho static\n"
+	# Unexpected arguments still go through argparse and fail
+	assert cli.main(["compile", str(script), "--bogus"]) == 2
+
+
+def test_analysis_hands_later_stages_name_sorted_variables(monkeypatch: pytest.MonkeyPatch):
+	"""Test that analysis exposes variables sorted by name and options are added in that order."""
+	monkeypatch.setenv("ZETA_HOME", "/z")
+	monkeypatch.setenv("ALPHA_HOME", "/a")
+	analysis, transform = run_pipeline_stages("echo $ZETA_HOME $ZED $ALPHA_HOME $ALPHA $MID\n", [])
+	assert list(analysis.undefined_vars) == ["ALPHA", "MID", "ZED"]
+	assert list(analysis.env_vars) == ["ALPHA_HOME", "ZETA_HOME"]
+	dests = [action.dest for action in transform.argument_parser._actions[1:]]
+	assert dests == ["ALPHA", "MID", "ZED", "ALPHA_HOME", "ZETA_HOME"]
+
+
+def test_run_returns_exit_status_when_script_exits_before_reading_all_input(tmp_path: Path):
+	"""Test that run reports the script's exit status when the shell stops reading early."""
+	# Larger than a pipe buffer, so the shell exits while argorator is still writing
+	script = write_temp_script(tmp_path, "#!/bin/bash\nexit 3\n" + "# padding\n" * 20000)
+	assert cli.main(["run", str(script)]) == 3
+
+
+def test_compile_output_honours_stdout_encoding(tmp_path: Path):
+	"""Test that compile output is written in the encoding stdout is configured with."""
+	script = write_temp_script(tmp_path, "#!/bin/bash\necho café\n")
+	src_path = Path(__file__).parent.parent / "src"
+	env = dict(os.environ, PYTHONPATH=str(src_path), PYTHONIOENCODING="latin-1")
+	result = subprocess.run(
+		[sys.executable, "-m", "argorator.cli", "compile", str(script)],
+		capture_output=True,
+		env=env,
+	)
+	assert result.returncode == 0
+	assert result.stdout.endswith("echo café\n".encode("latin-1"))
@@ -1,7 +1,12 @@
+import signal
 from pathlib import Path
 
+import pytest
+
 from argorator import cli
-from argorator.analyzers import parse_variable_usages
+from argorator.contexts import AnalysisContext, ExecuteContext
+from argorator.execution import read_script_text
+from argorator.analyzers import parse_defined_variables, parse_variable_usages, scan_script_references
 
 
 def write_script(tmp_path: Path, name: str, content: str) -> Path:
@@ -17,6 +22,21 @@ def test_parameter_expansion_detects_variable_usage():
 	assert "NAME" in used
 
 
+def test_nested_expansion_reports_inner_references():
+	"""Test that references inside a ${VAR:-...} default are reported."""
+	text = 'echo "${OUT:-$HOME/$1}" "$@"\n'
+	names, indices, varargs = scan_script_references(text)
+	assert names == {"OUT", "HOME"}
+	assert indices == {1}
+	assert varargs is True
+
+
+def test_braced_default_nested_in_braced_expansion_is_not_reported():
+	"""Only the outer name of ${A:-${B}} becomes an option, as it always has."""
+	assert parse_variable_usages("echo ${A:-${B}}\n") == {"A"}
+	assert parse_variable_usages("echo ${A:+${B:-c}}\n") == {"A"}
+
+
 def test_array_assignment_is_treated_as_defined_and_runs(tmp_path: Path):
 	script = write_script(
 		tmp_path,
@@ -60,4 +80,62 @@ EOF
 	)
 	# Our parser will detect NAME and require it; passing makes it run successfully
 	rc = cli.main(["run", str(script), "--name", "Ignored"])  # expansion won't occur because it's quoted
-	assert rc == 0
\ No newline at end of file
+	assert rc == 0
+
+
+def test_read_script_text_normalizes_line_endings(tmp_path: Path):
+	"""Test that CRLF and bare CR line endings are read as LF."""
+	path = tmp_path / "crlf.sh"
+	path.write_bytes(b"#!/bin/bash\r\necho $NAME\r\necho done\r")
+	assert read_script_text(path) == "#!/bin/bash\necho $NAME\necho done\n"
+
+
+def test_cached_parse_results_are_not_shared():
+	"""Test that mutating a parse result does not leak into the cache."""
+	text = "echo $CACHED_NAME\n"
+	first = parse_variable_usages(text)
+	first.add("INJECTED")
+	assert parse_variable_usages(text) == {"CACHED_NAME"}
+
+
+def test_defined_variables_match_declaration_forms():
+	"""Test which assignment and declaration forms count as definitions."""
+	text = "A=1\n  export B=2\ndeclare -x C=3\nlocal D =4\ndeclare -a -g E=5\necho F=6\nG+=7\nexport=8\n"
+	assert parse_defined_variables(text) == {"A", "B", "C", "D", "export"}
+
+
+def test_braced_reference_needs_a_closing_brace_later():
+	"""Test that ${NAME is only reported when a closing brace follows it."""
+	# The unclosed expansion runs to the next "}", swallowing ${CLOSED
+	assert parse_variable_usages("echo ${OPEN\necho ${CLOSED}\n") == {"OPEN"}
+	assert parse_variable_usages("echo ${CLOSED}\necho ${OPEN\n") == {"CLOSED"}
+	# Many unclosed expansions used to rescan the rest of the script each time
+	assert parse_variable_usages("echo ${A \n" * 20000) == set()
+
+
+def test_contexts_reject_unknown_fields_and_bad_indices():
+	"""Test that contexts reject misspelled fields and non-positive positional indices."""
+	context = AnalysisContext(script_text="")
+	context.varargs = True
+	with pytest.raises(AttributeError):
+		context.var_args = True
+	with pytest.raises(ValueError):
+		AnalysisContext(script_text="", positional_indices={0})
+
+
+def test_contexts_check_ranges_on_assignment():
+	"""Test that positional indices and exit codes are also checked when assigned later."""
+	analysis = AnalysisContext(script_text="")
+	with pytest.raises(ValueError):
+		analysis.positional_indices = {0, 1}
+	execute = ExecuteContext(compiled_script="")
+	execute.exit_code = 255
+	with pytest.raises(ValueError):
+		execute.exit_code = -15
+	assert execute.exit_code == 255
+
+
+def test_run_reports_signal_deaths_like_the_shell(tmp_path: Path):
+	"""Test that a script killed by a signal exits with 128 plus the signal number."""
+	script = write_script(tmp_path, "killed.sh", "#!/bin/bash\nkill -TERM $$\n")
+	assert cli.main(["run", str(script)]) == 128 + signal.SIGTERM
@@ -1,3 +1,5 @@
+import dataclasses
+
 import pytest
 from pathlib import Path
 from argorator import cli
@@ -53,11 +55,11 @@ def test_parse_google_choice_annotations():
     annotations = parse_arg_annotations(script)
     
     assert annotations["ENV"].type == "choice"
-    assert annotations["ENV"].choices == ["dev", "staging", "prod"]
+    assert annotations["ENV"].choices == ("dev", "staging", "prod")
     assert annotations["ENV"].help == "Deployment environment"
     
     assert annotations["COLOR"].type == "choice"
-    assert annotations["COLOR"].choices == ["red", "green", "blue"]
+    assert annotations["COLOR"].choices == ("red", "green", "blue")
     assert annotations["COLOR"].default == "blue"
 
 
@@ -90,7 +92,7 @@ def test_parse_lowercase_parameter_names():
     assert annotations["DEBUG_MODE"].default == "false"
     
     assert annotations["ENV_TYPE"].type == "choice"
-    assert annotations["ENV_TYPE"].choices == ["dev", "prod"]
+    assert annotations["ENV_TYPE"].choices == ("dev", "prod")
 
 
 def test_parse_mixed_case_parameter_names():
@@ -128,7 +130,7 @@ def test_parse_google_all_types():
     assert annotations["PRICE"].type == "float"
     assert annotations["ENABLED"].type == "bool"
     assert annotations["MODE"].type == "choice"
-    assert annotations["MODE"].choices == ["fast", "slow"]
+    assert annotations["MODE"].choices == ("fast", "slow")
 
 
 def test_google_annotations_with_argparse():
@@ -223,4 +225,38 @@ fi
                       "--service", "api", 
                       "--environment", "dev"])
     
-    assert result == 0  # Should succeed with defaults
\ No newline at end of file
+    assert result == 0  # Should succeed with defaults
+
+
+def test_cached_annotations_are_copied_per_call():
+    """Test that changing a returned result does not leak into later parses."""
+    script = "# PORT (int): Server port. Default: 8080\n"
+    first = parse_arg_annotations(script)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first["PORT"].help = "changed"
+    first["OTHER"] = ArgumentAnnotation()
+    
+    second = parse_arg_annotations(script)
+    assert set(second) == {"PORT"}
+    assert second["PORT"].help == "Server port"
+
+
+def test_cached_choices_are_immutable():
+    """Test that choices of a cached annotation cannot be changed by a caller."""
+    script = "# MODE (choice[a, b]): mode\n"
+    annotation = parse_arg_annotations(script)["MODE"]
+    assert annotation.choices == ("a", "b")
+    with pytest.raises(AttributeError):
+        annotation.choices.append("evil")
+    hash(annotation)
+    assert parse_arg_annotations(script)["MODE"].choices == ("a", "b")
+    assert ArgumentAnnotation(type="choice", choices=["x", "y"]).choices == ("x", "y")
+
+
+def test_whitespace_heavy_lines_do_not_backtrack():
+    """Test that long non-matching annotation lines are rejected in linear time."""
+    script = "\n".join([
+        "# X:" + " " * 50000 + ".x",
+        "# Y (int)" + " " * 50000 + "[alias:" + " " * 50000,
+    ])
+    assert parse_arg_annotations(script) == {}
@@ -437,6 +437,17 @@ echo "test"'''
         assert "INVALID MACRO SYNTAX" in errors[0]
         assert "CORRECT SYNTAX EXAMPLES" in errors[0]
     
+    def test_compile_macros_validates_and_transforms(self):
+        """Test compile_macros transforms valid macros and raises on invalid ones."""
+        valid = '''# for file in *.txt
+echo "$file"'''
+        assert macro_processor.compile_macros(valid) == macro_processor.process_macros(valid)
+        
+        invalid = '''# for 123invalid in source
+echo "test"'''
+        with pytest.raises(ValueError, match="Macro validation failed"):
+            macro_processor.compile_macros(invalid)
+    
     def test_mixed_supported_scenarios(self):
         """Test complex but supported combinations of macros."""
         script = '''# Process individual files